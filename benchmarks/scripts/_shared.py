@@ -0,0 +1,59 @@
+"""benchmark 脚本共用的辅助函数"""
+import gzip
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from src.tools.context_tools import ContextTools
+from src.utils.json_io import dumps_bytes, loads
+
+# 并发运行用例的默认线程数：每个线程主要在等待用例子进程，
+# 子进程本身占用 CPU，因此与 CPU 核数一致
+DEFAULT_WORKERS = os.cpu_count() or 4
+
+
+@lru_cache(maxsize=None)
+def get_context_tools(project_path: str) -> ContextTools:
+    """获取项目目录的 ContextTools
+
+    同一目录在进程内只构建一次索引，所有脚本、阈值和用例共用
+    """
+    return ContextTools(project_path)
+
+
+# 压缩级别：结果文件以文本为主，低级别已能缩小数倍且几乎不占 CPU
+_GZIP_LEVEL = 3
+
+
+def dump_json(path, data: Any, default: Optional[Callable] = None):
+    """保存 JSON 结果文件
+
+    完整序列化后一次写入；安装了 orjson 时直接输出字节串，比标准库快数倍。
+    路径以 .gz 结尾时写入 gzip 压缩文件
+    """
+    raw = dumps_bytes(data, default=default)
+    if str(path).endswith('.gz'):
+        raw = gzip.compress(raw, compresslevel=_GZIP_LEVEL)
+    Path(path).write_bytes(raw)
+
+
+def load_json(path) -> Any:
+    """读取 JSON 文件（安装了 orjson 时用 orjson 解析），.gz 文件自动解压"""
+    raw = Path(path).read_bytes()
+    if str(path).endswith('.gz'):
+        raw = gzip.decompress(raw)
+    return loads(raw)
+
+
+def gzip_file(path) -> Path:
+    """把文件压缩为同名 .gz 文件并删除原文件，返回压缩后的路径
+
+    逐条追加的结果日志先写普通文本，结束后再压缩：
+    直接追加 gzip 流时进程被中断会留下没有结束标记的文件，读取时报 EOFError
+    """
+    path = Path(path)
+    gz_path = path.with_name(path.name + '.gz')
+    gz_path.write_bytes(gzip.compress(path.read_bytes(), compresslevel=_GZIP_LEVEL))
+    path.unlink()
+    return gz_path
@@ -16,11 +16,11 @@
 
 import sys
 import os
-import json
 import time
 import subprocess
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 import asyncio
 
@@ -29,7 +29,8 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from src.core.error_identifier import ErrorIdentifier
 from src.strategies.registry import ErrorStrategyRegistry
-from src.tools_new.context_tools import ContextTools
+
+from _shared import DEFAULT_WORKERS, dump_json, get_context_tools, load_json
 
 
 class ConfidenceThresholdTester:
@@ -39,6 +40,17 @@ class ConfidenceThresholdTester:
         self.test_cases_dir = Path(test_cases_dir)
         self.error_identifier = ErrorIdentifier()
         self.results = []
+        # 跨阈值共享：注册表按阈值只构建一次（ContextTools 由 get_context_tools 共享）
+        self._registries: Dict[float, ErrorStrategyRegistry] = {}
+
+    def _get_registry(self, threshold: float) -> ErrorStrategyRegistry:
+        """获取指定阈值的策略注册表（同一阈值只构建一次）"""
+        registry = self._registries.get(threshold)
+        if registry is None:
+            registry = ErrorStrategyRegistry()
+            registry.register_all_defaults(confidence_threshold=threshold)
+            self._registries[threshold] = registry
+        return registry
 
     def load_test_cases(self) -> Dict[str, List[Path]]:
         """加载所有测试用例，按错误类型分类"""
@@ -66,8 +78,7 @@ class ConfidenceThresholdTester:
         metadata_file = case_dir / "metadata.json"
         metadata = {}
         if metadata_file.exists():
-            with open(metadata_file) as f:
-                metadata = json.load(f)
+            metadata = load_json(metadata_file)
 
         # 运行测试获取错误
         try:
@@ -105,9 +116,8 @@ class ConfidenceThresholdTester:
     ) -> Dict:
         """测试单个用例在指定阈值下的表现"""
 
-        # 创建策略注册表
-        registry = ErrorStrategyRegistry()
-        registry.register_all_defaults(confidence_threshold=threshold)
+        # 获取策略注册表
+        registry = self._get_registry(threshold)
 
         # 获取对应的策略
         strategy = registry.get(error_type)
@@ -118,14 +128,17 @@ class ConfidenceThresholdTester:
                 'reason': 'No strategy found'
             }
 
-        # 提取错误信息
+        # 提取错误信息（与阈值无关，每个用例只提取一次，后续阈值直接复用）
         error = test_case['error']
-        extracted = strategy.extract(error.error_message)
+        extracted = test_case.get('extracted')
+        if extracted is None:
+            extracted = strategy.extract(error.error_message)
+            test_case['extracted'] = extracted
 
         # 创建 ContextTools（需要项目路径）
         case_dir = Path(test_case['case_dir'])
         try:
-            context_tools = ContextTools(str(case_dir))
+            context_tools = get_context_tools(str(case_dir))
 
             # 执行快速搜索
             search_result = strategy.fast_search(
@@ -154,7 +167,33 @@ class ConfidenceThresholdTester:
                 'reason': f'Error: {str(e)[:100]}'
             }
 
-    def test_threshold(self, threshold: float, test_cases: Dict[str, List[Path]]) -> Dict:
+    def prepare_test_cases(
+        self,
+        test_cases: Dict[str, List[Path]],
+        workers: int = DEFAULT_WORKERS
+    ) -> Dict[str, List[Dict]]:
+        """一次性运行所有用例并识别错误
+
+        错误信息与阈值无关，批量准备一次后供所有阈值复用，
+        避免每个阈值都重新启动子进程。各用例子进程相互独立，用线程池并发运行
+        """
+        prepared = defaultdict(list)
+        jobs = [
+            (error_type, case_dir)
+            for error_type, cases in test_cases.items()
+            for case_dir in cases
+        ]
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            # map 按提交顺序返回，用例顺序与串行执行一致
+            outcomes = executor.map(self.run_test_case, [case_dir for _, case_dir in jobs])
+            for (error_type, _), test_case in zip(jobs, outcomes):
+                if test_case:
+                    prepared[error_type].append(test_case)
+
+        return prepared
+
+    def test_threshold(self, threshold: float, prepared_cases: Dict[str, List[Dict]]) -> Dict:
         """测试指定阈值下的整体表现"""
         print(f"\n{'='*60}")
         print(f"测试阈值: {threshold}")
@@ -162,15 +201,10 @@ class ConfidenceThresholdTester:
 
         results_by_type = defaultdict(list)
 
-        for error_type, cases in test_cases.items():
+        for error_type, cases in prepared_cases.items():
             print(f"\n{error_type}: {len(cases)} 个用例")
 
-            for case_dir in cases:
-                # 运行测试用例
-                test_case = self.run_test_case(case_dir)
-                if not test_case:
-                    continue
-
+            for test_case in cases:
                 # 测试策略置信度
                 result = self.test_strategy_confidence(
                     error_type,
@@ -244,10 +278,13 @@ class ConfidenceThresholdTester:
             total += len(cases)
         print(f"  {'总计':20s} {total} 个")
 
+        # 所有用例只运行一次，结果供各阈值复用
+        prepared_cases = self.prepare_test_cases(test_cases)
+
         # 对每个阈值进行测试
         all_results = []
         for threshold in thresholds:
-            result = self.test_threshold(threshold, test_cases)
+            result = self.test_threshold(threshold, prepared_cases)
             all_results.append(result)
             self.results.append(result)
 
@@ -289,8 +326,8 @@ class ConfidenceThresholdTester:
             report.append("|------|---------------|-----------|--------|")
 
             for result in results:
-                if error_type in result['by_type']:
-                    stats = result['by_type'][error_type]
+                stats = result['by_type'].get(error_type)
+                if stats:
                     report.append(
                         f"| {result['threshold']:.2f} | "
                         f"{stats['fast_path_rate']*100:.1f}% | "
@@ -304,16 +341,18 @@ class ConfidenceThresholdTester:
 
         # 找出最优阈值
         best_overall = max(results, key=lambda r: r['overall']['fast_path_rate'])
+        best_stats = best_overall['overall']
         report.append(f"\n**整体最优阈值**: {best_overall['threshold']:.2f}")
-        report.append(f"  - 快速路径命中率: {best_overall['overall']['fast_path_rate']*100:.1f}%")
-        report.append(f"  - 平均置信度: {best_overall['overall']['avg_confidence']:.3f}")
+        report.append(f"  - 快速路径命中率: {best_stats['fast_path_rate']*100:.1f}%")
+        report.append(f"  - 平均置信度: {best_stats['avg_confidence']:.3f}")
 
         # 按错误类型推荐
         report.append("\n**按错误类型推荐**:")
         for error_type in sorted(error_types):
             type_results = [
-                (r['threshold'], r['by_type'][error_type]['fast_path_rate'])
-                for r in results if error_type in r['by_type']
+                (r['threshold'], stats['fast_path_rate'])
+                for r in results
+                if (stats := r['by_type'].get(error_type))
             ]
             best_threshold, best_rate = max(type_results, key=lambda x: x[1])
             report.append(f"  - {error_type:20s} {best_threshold:.2f} (命中率 {best_rate*100:.1f}%)")
@@ -322,8 +361,7 @@ class ConfidenceThresholdTester:
 
     def save_results(self, filename: str = "confidence_test_results.json"):
         """保存测试结果"""
-        with open(filename, 'w') as f:
-            json.dump(self.results, f, indent=2)
+        dump_json(filename, self.results)
         print(f"\n✅ 结果已保存到: {filename}")
 
 
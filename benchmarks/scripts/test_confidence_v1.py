@@ -2,17 +2,18 @@
 """V1 简单用例置信度阈值测试"""
 import sys
 import os
-import json
 import subprocess
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.core.error_identifier import ErrorIdentifier
 from src.strategies.registry import ErrorStrategyRegistry
-from src.tools_new.context_tools import ContextTools
+
+from _shared import DEFAULT_WORKERS, dump_json, get_context_tools, load_json
 
 
 class V1ConfidenceThresholdTester:
@@ -22,6 +23,17 @@ class V1ConfidenceThresholdTester:
         self.test_cases_dir = Path(test_cases_dir)
         self.error_identifier = ErrorIdentifier()
         self.results = []
+        # 跨阈值共享：注册表按阈值只构建一次（ContextTools 由 get_context_tools 共享）
+        self._registries: Dict[float, ErrorStrategyRegistry] = {}
+
+    def _get_registry(self, threshold: float) -> ErrorStrategyRegistry:
+        """获取指定阈值的策略注册表（同一阈值只构建一次）"""
+        registry = self._registries.get(threshold)
+        if registry is None:
+            registry = ErrorStrategyRegistry()
+            registry.register_all_defaults(confidence_threshold=threshold)
+            self._registries[threshold] = registry
+        return registry
 
     def load_test_cases(self) -> List[Path]:
         """加载所有 V1 测试用例"""
@@ -43,8 +55,7 @@ class V1ConfidenceThresholdTester:
         metadata_file = case_dir / "metadata.json"
         metadata = {}
         if metadata_file.exists():
-            with open(metadata_file) as f:
-                metadata = json.load(f)
+            metadata = load_json(metadata_file)
 
         # 运行测试获取错误
         try:
@@ -80,9 +91,8 @@ class V1ConfidenceThresholdTester:
     ) -> Dict:
         """测试单个用例在指定阈值下的表现"""
 
-        # 创建策略注册表
-        registry = ErrorStrategyRegistry()
-        registry.register_all_defaults(confidence_threshold=threshold)
+        # 获取策略注册表
+        registry = self._get_registry(threshold)
 
         # 获取对应的策略
         error_type = test_case['error_type']
@@ -94,14 +104,17 @@ class V1ConfidenceThresholdTester:
                 'reason': 'No strategy found'
             }
 
-        # 提取错误信息
+        # 提取错误信息（与阈值无关，每个用例只提取一次，后续阈值直接复用）
         error = test_case['error']
-        extracted = strategy.extract(error.error_message)
+        extracted = test_case.get('extracted')
+        if extracted is None:
+            extracted = strategy.extract(error.error_message)
+            test_case['extracted'] = extracted
 
         # 创建 ContextTools
         case_dir = Path(test_case['case_dir'])
         try:
-            context_tools = ContextTools(str(case_dir))
+            context_tools = get_context_tools(str(case_dir))
 
             # 执行快速搜索
             search_result = strategy.fast_search(
@@ -121,8 +134,7 @@ class V1ConfidenceThresholdTester:
                 return {
                     'used_fast_path': False,
                     'confidence': search_result.confidence if search_result else 0.0,
-                    'reason': f'Confidence {search_result.confidence if search_result else 0.0:.2f} below threshold {threshold}',
-                    'search_result': search_result
+                    'reason': f'Confidence {search_result.confidence if search_result else 0.0:.2f} below threshold {threshold}'
                 }
         except Exception as e:
             import traceback
@@ -133,7 +145,17 @@ class V1ConfidenceThresholdTester:
                 'traceback': traceback.format_exc()
             }
 
-    def test_threshold(self, threshold: float, test_cases: List[Path]) -> Dict:
+    def prepare_test_cases(self, test_cases: List[Path], workers: int = DEFAULT_WORKERS) -> List[Dict]:
+        """一次性运行所有用例，结果供各阈值复用
+
+        各用例子进程相互独立，用线程池并发运行
+        """
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            # map 按提交顺序返回，用例顺序与串行执行一致
+            outcomes = executor.map(self.run_test_case, test_cases)
+            return [test_case for test_case in outcomes if test_case]
+
+    def test_threshold(self, threshold: float, prepared_cases: List[Dict]) -> Dict:
         """测试指定阈值下的整体表现"""
         print(f"\n{'='*70}")
         print(f"测试阈值: {threshold}")
@@ -141,12 +163,7 @@ class V1ConfidenceThresholdTester:
 
         results = []
 
-        for case_dir in test_cases:
-            # 运行测试用例
-            test_case = self.run_test_case(case_dir)
-            if not test_case:
-                continue
-
+        for test_case in prepared_cases:
             # 测试策略置信度
             result = self.test_strategy_confidence(test_case, threshold)
 
@@ -219,10 +236,13 @@ class V1ConfidenceThresholdTester:
 
         print(f"\n加载 V1 测试用例: {len(test_cases)} 个")
 
+        # 所有用例只运行一次，结果供各阈值复用
+        prepared_cases = self.prepare_test_cases(test_cases)
+
         # 对每个阈值进行测试
         all_results = []
         for threshold in thresholds:
-            result = self.test_threshold(threshold, test_cases)
+            result = self.test_threshold(threshold, prepared_cases)
             all_results.append(result)
             self.results.append(result)
 
@@ -264,8 +284,8 @@ class V1ConfidenceThresholdTester:
             report.append("|------|---------------|-----------|--------|")
 
             for result in results:
-                if edit_dist in result.get('by_edit_distance', {}):
-                    stats = result['by_edit_distance'][edit_dist]
+                stats = result.get('by_edit_distance', {}).get(edit_dist)
+                if stats:
                     report.append(
                         f"| {result['threshold']:.2f} | "
                         f"{stats['fast_path_rate']*100:.1f}% | "
@@ -283,9 +303,9 @@ class V1ConfidenceThresholdTester:
         for result in results:
             threshold = result['threshold']
             for case_result in result.get('results', []):
-                case_id = case_result['case_id']
-                case_results[case_id]['edit_distance'] = case_result['edit_distance']
-                case_results[case_id][threshold] = case_result['confidence']
+                case_data = case_results[case_result['case_id']]
+                case_data['edit_distance'] = case_result['edit_distance']
+                case_data[threshold] = case_result['confidence']
 
         for case_id in sorted(case_results.keys()):
             data = case_results[case_id]
@@ -302,9 +322,10 @@ class V1ConfidenceThresholdTester:
         report.append("\n## 建议")
 
         best_threshold = max(results, key=lambda r: r['overall']['fast_path_rate'])
+        best_stats = best_threshold['overall']
         report.append(f"\n**最优阈值**: {best_threshold['threshold']:.2f}")
-        report.append(f"  - 快速路径命中率: {best_threshold['overall']['fast_path_rate']*100:.1f}%")
-        report.append(f"  - 平均置信度: {best_threshold['overall']['avg_confidence']:.3f}")
+        report.append(f"  - 快速路径命中率: {best_stats['fast_path_rate']*100:.1f}%")
+        report.append(f"  - 平均置信度: {best_stats['avg_confidence']:.3f}")
 
         return "\n".join(report)
 
@@ -321,8 +342,7 @@ def main():
     print(report)
 
     # 保存结果
-    with open("confidence_test_v1_results.json", 'w') as f:
-        json.dump(tester.results, f, indent=2, default=str)
+    dump_json("confidence_test_v1_results.json", tester.results, default=str)
     print("\n✅ 结果已保存到: confidence_test_v1_results.json")
 
     # 保存报告
@@ -1,28 +1,35 @@
 #!/usr/bin/env python3
 """MiMo 自动化批量测试 - 真实修复 + 自动还原"""
+import asyncio
 import sys
 import os
-import json
 import time
 import subprocess
 import shutil
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.core.error_identifier import ErrorIdentifier
-from src.agent.debug_agent import DebugAgent
+from src.utils.json_io import dumps_bytes
+from _shared import dump_json, gzip_file, load_json
 
 
 class MiMoAutoTester:
     """MiMo 自动化测试器"""
 
-    def __init__(self, test_cases_dir: str = "tests/test_cases_v2"):
+    def __init__(self, test_cases_dir: str = "tests/test_cases_v2", compress: bool = False):
         self.test_cases_dir = Path(test_cases_dir)
         self.backup_dir = Path("/tmp/v2_test_backup")
         self.results = []
+        self.timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        # 结果文件是否 gzip 压缩（含完整错误输出，用例多时体积较大）
+        self.suffix = ".gz" if compress else ""
+        # 错误识别器不依赖用例目录，所有用例共用一个
+        self.error_identifier = ErrorIdentifier()
 
         # 检测模型
         base_url = os.getenv('ANTHROPIC_BASE_URL', 'Anthropic Official API')
@@ -37,8 +44,11 @@ class MiMoAutoTester:
         print(f"{'='*70}\n")
 
     def load_test_cases(self, limit: int = None) -> list:
-        """加载测试用例"""
-        test_cases = []
+        """加载测试用例
+
+        先遍历目录确定用例清单，再用线程池并发读取各用例的 metadata.json
+        """
+        case_dirs = []
 
         for error_type_dir in sorted(self.test_cases_dir.iterdir()):
             if not error_type_dir.is_dir() or error_type_dir.name.startswith('.'):
@@ -48,23 +58,32 @@ class MiMoAutoTester:
 
             for case_dir in sorted(error_type_dir.iterdir()):
                 if case_dir.is_dir() and (case_dir / "main.py").exists():
-                    metadata_file = case_dir / "metadata.json"
-                    metadata = {}
-                    if metadata_file.exists():
-                        with open(metadata_file) as f:
-                            metadata = json.load(f)
-
-                    test_cases.append({
-                        'path': case_dir,
-                        'error_type': error_type,
-                        'case_id': metadata.get('case_id', case_dir.name),
-                        'difficulty': metadata.get('difficulty', 'unknown')
-                    })
-
-                    if limit and len(test_cases) >= limit:
-                        return test_cases
+                    case_dirs.append((case_dir, error_type))
+                    if limit and len(case_dirs) >= limit:
+                        break
+            if limit and len(case_dirs) >= limit:
+                break
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            # map 按提交顺序返回，用例顺序与目录遍历顺序一致
+            metadatas = executor.map(self._read_metadata, [case_dir for case_dir, _ in case_dirs])
+            return [
+                {
+                    'path': case_dir,
+                    'error_type': error_type,
+                    'case_id': metadata.get('case_id', case_dir.name),
+                    'difficulty': metadata.get('difficulty', 'unknown')
+                }
+                for (case_dir, error_type), metadata in zip(case_dirs, metadatas)
+            ]
 
-        return test_cases
+    @staticmethod
+    def _read_metadata(case_dir: Path) -> dict:
+        """读取用例的 metadata.json（不存在时返回空字典）"""
+        metadata_file = case_dir / "metadata.json"
+        if not metadata_file.exists():
+            return {}
+        return load_json(metadata_file)
 
     def backup_case(self, case_dir: Path) -> Path:
         """备份测试用例"""
@@ -159,13 +178,11 @@ class MiMoAutoTester:
 
             # 3. 使用 Debug Agent 修复
             print(f"🔧 启动 Debug Agent 修复...")
-            start_time = time.time()
+            start_time = time.perf_counter()
 
             try:
                 # 识别错误文件
-                from src.core.error_identifier import ErrorIdentifier
-                identifier = ErrorIdentifier()
-                error = identifier.identify(initial_result['stderr'])
+                error = self.error_identifier.identify(initial_result['stderr'])
 
                 # 读取出错文件的代码
                 error_file_path = case_dir / Path(error.error_file).name if error.error_file else case_dir / "main.py"
@@ -174,24 +191,27 @@ class MiMoAutoTester:
                 else:
                     buggy_code = ""
 
-                # 创建 agent
+                # DebugAgent 会连带导入 LLM 客户端等较重的依赖，
+                # 直到确实有需要修复的用例时才导入
+                from src.agent.debug_agent import DebugAgent
+
+                # 创建 agent（每个用例目录不同，且内部异步客户端绑定事件循环，不跨用例复用）
                 agent = DebugAgent(
                     project_path=str(case_dir)
                 )
 
                 # 运行调试（异步）
-                import asyncio
                 fix_result = asyncio.run(agent.debug(
                     buggy_code=buggy_code,
                     error_traceback=initial_result['stderr'],
                     error_file=str(error.error_file) if error.error_file else ""
                 ))
-                duration = time.time() - start_time
+                duration = time.perf_counter() - start_time
 
                 print(f"   修复耗时: {duration:.1f}s")
 
             except Exception as e:
-                duration = time.time() - start_time
+                duration = time.perf_counter() - start_time
                 print(f"   ❌ Debug Agent 异常: {str(e)[:100]}")
 
                 self.restore_case(case_dir, backup_path)
@@ -249,20 +269,37 @@ class MiMoAutoTester:
             print(f"(限制: 前 {limit} 个)")
         print()
 
-        # 运行测试
-        for i, case_info in enumerate(test_cases, 1):
-            result = self.test_single_case(case_info, i, len(test_cases))
+        # 每个用例完成后向 JSONL 追加一行（中途中断也保留已完成的结果），
+        # 完整的汇总 JSON 只在最后写一次。JSONL 始终以普通文本追加，
+        # 需要压缩时在结束（包括中断）后整体压缩，保证进程被杀掉时文件仍可读
+        progress_file = f"{self.model_name}_v2_results_{self.timestamp}.jsonl"
+        print(f"逐条结果: {progress_file}{self.suffix}")
 
-            if not result.get('skipped'):
-                self.results.append(result)
-
-            # 显示统计
-            if self.results:
-                success_count = sum(1 for r in self.results if r.get('success'))
-                avg_duration = sum(r.get('duration', 0) for r in self.results) / len(self.results)
-                print(f"\n📊 当前统计: {success_count}/{len(self.results)} 成功 " +
-                      f"({success_count/len(self.results)*100:.1f}%) | " +
-                      f"平均耗时: {avg_duration:.1f}s")
+        # 运行测试（累计成功数和总耗时，避免每个用例后重新遍历全部结果）
+        success_count = 0
+        total_duration = 0.0
+        try:
+            with open(progress_file, 'ab') as progress_log:
+                for i, case_info in enumerate(test_cases, 1):
+                    result = self.test_single_case(case_info, i, len(test_cases))
+
+                    progress_log.write(dumps_bytes(result, indent=False) + b"\n")
+                    progress_log.flush()
+
+                    if not result.get('skipped'):
+                        self.results.append(result)
+                        success_count += bool(result.get('success'))
+                        total_duration += result.get('duration', 0)
+
+                    # 显示统计
+                    if self.results:
+                        avg_duration = total_duration / len(self.results)
+                        print(f"\n📊 当前统计: {success_count}/{len(self.results)} 成功 " +
+                              f"({success_count/len(self.results)*100:.1f}%) | " +
+                              f"平均耗时: {avg_duration:.1f}s")
+        finally:
+            if self.suffix:
+                gzip_file(progress_file)
 
         # 生成报告
         self.generate_report()
@@ -283,13 +320,29 @@ class MiMoAutoTester:
             print("\n⚠️  无有效测试结果")
             return
 
-        # 整体统计
+        # 一次遍历同时完成整体、按错误类型、按难度的统计
         total = len(self.results)
-        success_count = sum(1 for r in self.results if r.get('success'))
-        success_rate = success_count / total * 100
+        success_count = 0
+        durations = []
+        by_type = defaultdict(lambda: {'total': 0, 'success': 0, 'durations': []})
+        by_difficulty = defaultdict(lambda: {'total': 0, 'success': 0})
+        for r in self.results:
+            success = bool(r.get('success'))
+            duration = r.get('duration', 0)
+            success_count += success
+            durations.append(duration)
+
+            type_stats = by_type[r.get('error_type', 'unknown')]
+            type_stats['total'] += 1
+            type_stats['success'] += success
+            type_stats['durations'].append(duration)
 
-        durations = [r.get('duration', 0) for r in self.results]
-        avg_duration = sum(durations) / len(durations)
+            difficulty_stats = by_difficulty[r.get('difficulty', 'unknown')]
+            difficulty_stats['total'] += 1
+            difficulty_stats['success'] += success
+
+        success_rate = success_count / total * 100
+        avg_duration = sum(durations) / total
         min_duration = min(durations)
         max_duration = max(durations)
 
@@ -300,15 +353,6 @@ class MiMoAutoTester:
         print(f"   平均耗时: {avg_duration:.1f}s")
         print(f"   最快: {min_duration:.1f}s | 最慢: {max_duration:.1f}s")
 
-        # 按错误类型统计
-        by_type = defaultdict(lambda: {'total': 0, 'success': 0, 'durations': []})
-        for r in self.results:
-            error_type = r.get('error_type', 'unknown')
-            by_type[error_type]['total'] += 1
-            if r.get('success'):
-                by_type[error_type]['success'] += 1
-            by_type[error_type]['durations'].append(r.get('duration', 0))
-
         print(f"\n## 按错误类型统计")
         print(f"{'类型':<20s} {'成功率':<20s} {'平均耗时'}")
         print("-" * 60)
@@ -317,14 +361,6 @@ class MiMoAutoTester:
             avg_dur = sum(stats['durations']) / len(stats['durations'])
             print(f"{error_type:<20s} {stats['success']}/{stats['total']} ({rate:>5.1f}%) {avg_dur:>10.1f}s")
 
-        # 按难度统计
-        by_difficulty = defaultdict(lambda: {'total': 0, 'success': 0})
-        for r in self.results:
-            difficulty = r.get('difficulty', 'unknown')
-            by_difficulty[difficulty]['total'] += 1
-            if r.get('success'):
-                by_difficulty[difficulty]['success'] += 1
-
         print(f"\n## 按难度统计")
         print(f"{'难度':<20s} {'成功率'}")
         print("-" * 40)
@@ -333,24 +369,23 @@ class MiMoAutoTester:
             print(f"{difficulty:<20s} {stats['success']}/{stats['total']} ({rate:.1f}%)")
 
         # 保存结果
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        result_file = f"{self.model_name}_v2_results_{timestamp}.json"
-
-        with open(result_file, 'w') as f:
-            json.dump({
-                'timestamp': timestamp,
-                'model': self.model_name,
-                'base_url': os.getenv('ANTHROPIC_BASE_URL', 'Anthropic Official'),
-                'total': total,
-                'success_count': success_count,
-                'success_rate': success_rate,
-                'avg_duration': avg_duration,
-                'min_duration': min_duration,
-                'max_duration': max_duration,
-                'by_type': dict(by_type),
-                'by_difficulty': dict(by_difficulty),
-                'results': self.results
-            }, f, indent=2)
+        timestamp = self.timestamp
+        result_file = f"{self.model_name}_v2_results_{timestamp}.json{self.suffix}"
+
+        dump_json(result_file, {
+            'timestamp': timestamp,
+            'model': self.model_name,
+            'base_url': os.getenv('ANTHROPIC_BASE_URL', 'Anthropic Official'),
+            'total': total,
+            'success_count': success_count,
+            'success_rate': success_rate,
+            'avg_duration': avg_duration,
+            'min_duration': min_duration,
+            'max_duration': max_duration,
+            'by_type': dict(by_type),
+            'by_difficulty': dict(by_difficulty),
+            'results': self.results
+        })
 
         print(f"\n✅ 详细结果已保存到: {result_file}")
 
@@ -362,6 +397,7 @@ def main():
     parser.add_argument('--limit', type=int, help='限制测试用例数量')
     parser.add_argument('--quick', action='store_true', help='快速测试（6个用例）')
     parser.add_argument('--all', action='store_true', help='测试全部30个用例')
+    parser.add_argument('--gzip', action='store_true', help='结果文件以 gzip 压缩保存（.gz）')
 
     args = parser.parse_args()
 
@@ -372,7 +408,7 @@ def main():
     else:
         limit = args.limit
 
-    tester = MiMoAutoTester()
+    tester = MiMoAutoTester(compress=args.gzip)
     tester.run_batch_test(limit=limit)
 
 
@@ -2,7 +2,7 @@
 """测试 MiMo 真实修复能力 - 测试完自动还原"""
 import sys
 import os
-import json
+import re
 import time
 import subprocess
 import shutil
@@ -12,6 +12,9 @@ from collections import defaultdict
 
 sys.path.insert(0, str(Path(__file__).parent))
 
+from src.core.pattern_fixer import PatternFixer
+from _shared import dump_json, load_json
+
 
 class RealFixTester:
     """真实修复测试器 - 测试完自动还原"""
@@ -20,6 +23,8 @@ class RealFixTester:
         self.test_cases_dir = Path(test_cases_dir)
         self.results = []
         self.backup_dir = Path("/tmp/v2_backup")
+        # PatternFixer 无状态，所有用例共用一个实例
+        self.pattern_fixer = PatternFixer()
 
         # 检测模型
         base_url = os.getenv('ANTHROPIC_BASE_URL', 'Anthropic Official API')
@@ -133,9 +138,6 @@ class RealFixTester:
 
     def simple_pattern_fix(self, case_dir: Path, error_type: str, error_msg: str) -> dict:
         """简单模式修复（基于规则）"""
-        import re
-        from src.core.pattern_fixer import PatternFixer
-
         try:
             # 读取错误文件
             if 'File' in error_msg:
@@ -147,8 +149,7 @@ class RealFixTester:
                             content = f.read()
 
                         # 使用 PatternFixer
-                        fixer = PatternFixer()
-                        fixed_content = fixer.fix(content, error_msg)
+                        fixed_content = self.pattern_fixer.fix(content, error_msg)
 
                         if fixed_content != content:
                             with open(error_file_path, 'w') as f:
@@ -178,8 +179,7 @@ class RealFixTester:
         metadata_file = case_dir / "metadata.json"
         metadata = {}
         if metadata_file.exists():
-            with open(metadata_file) as f:
-                metadata = json.load(f)
+            metadata = load_json(metadata_file)
 
         case_id = metadata.get('case_id', case_dir.name)
         difficulty = metadata.get('difficulty', 'unknown')
@@ -215,7 +215,7 @@ class RealFixTester:
 
         # 3. 尝试修复
         print(f"🔧 尝试自动修复...")
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         fix_result = self.simple_pattern_fix(
             case_dir,
@@ -223,7 +223,7 @@ class RealFixTester:
             initial_result['stderr']
         )
 
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
 
         # 4. 验证修复
         if fix_result.get('success'):
@@ -333,17 +333,16 @@ class RealFixTester:
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         result_file = f"mimo_real_fix_results_{timestamp}.json"
 
-        with open(result_file, 'w') as f:
-            json.dump({
-                'timestamp': timestamp,
-                'model': self.model_name,
-                'base_url': os.getenv('ANTHROPIC_BASE_URL', 'Anthropic Official'),
-                'total': total,
-                'success_count': success_count,
-                'success_rate': success_rate,
-                'avg_duration': avg_duration,
-                'results': self.results
-            }, f, indent=2)
+        dump_json(result_file, {
+            'timestamp': timestamp,
+            'model': self.model_name,
+            'base_url': os.getenv('ANTHROPIC_BASE_URL', 'Anthropic Official'),
+            'total': total,
+            'success_count': success_count,
+            'success_rate': success_rate,
+            'avg_duration': avg_duration,
+            'results': self.results
+        })
 
         print(f"\n✅ 详细结果已保存到: {result_file}")
 
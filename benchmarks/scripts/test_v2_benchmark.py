@@ -2,18 +2,20 @@
 """V2 Benchmark 批量测试脚本 - 支持 MiMo vs Claude 对比"""
 import sys
 import os
-import json
 import time
 import subprocess
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.core.error_identifier import ErrorIdentifier
 from src.strategies.registry import ErrorStrategyRegistry
-from src.tools_new.context_tools import ContextTools
+
+from _shared import DEFAULT_WORKERS, dump_json, get_context_tools, load_json
 
 
 class V2BenchmarkTester:
@@ -23,6 +25,11 @@ class V2BenchmarkTester:
         self.test_cases_dir = Path(test_cases_dir)
         self.results = []
 
+        # 错误识别器和策略注册表无状态，所有用例（包括并发线程）共用一份
+        self.identifier = ErrorIdentifier()
+        self.registry = ErrorStrategyRegistry()
+        self.registry.register_all_defaults()
+
         # 检测当前使用的模型
         base_url = os.getenv('ANTHROPIC_BASE_URL', 'Anthropic Official API')
         self.model_name = 'mimo' if 'mimo' in base_url.lower() else 'claude'
@@ -57,7 +64,36 @@ class V2BenchmarkTester:
         return test_cases
 
     def test_single_case(self, case_info: dict, index: int, total: int) -> dict:
-        """测试单个用例"""
+        """测试单个用例，结束后一次性输出该用例的日志"""
+        result, output = self._collect_case(case_info, index, total)
+        sys.stdout.write(output)
+        sys.stdout.flush()
+        return result
+
+    def _collect_case(self, case_info: dict, index: int, total: int) -> tuple:
+        """测试单个用例，返回 (结果, 输出文本)
+
+        用例的输出先收集起来，由调用方统一写出，
+        并发运行时工作线程不直接写 stdout，也就不会交错或争用输出
+        """
+        log = []
+        try:
+            result = self._run_case(case_info, index, total, log)
+        except Exception as e:
+            # 用例准备阶段（如读取 metadata）出错：记为失败结果，输出同样交给调用方写出
+            log.append(f"❌ 异常: {str(e)[:100]}")
+            result = {
+                'case_id': case_info['path'].name,
+                'error_type': case_info['error_type'],
+                'difficulty': 'unknown',
+                'success': False,
+                'duration': 0,
+                'error': str(e)[:200]
+            }
+        return result, "\n".join(log) + "\n"
+
+    def _run_case(self, case_info: dict, index: int, total: int, log: list) -> dict:
+        """执行单个用例，输出追加到 log"""
         case_dir = case_info['path']
         error_type = case_info['error_type']
 
@@ -65,16 +101,15 @@ class V2BenchmarkTester:
         metadata_file = case_dir / "metadata.json"
         metadata = {}
         if metadata_file.exists():
-            with open(metadata_file) as f:
-                metadata = json.load(f)
+            metadata = load_json(metadata_file)
 
         case_id = metadata.get('case_id', case_dir.name)
         difficulty = metadata.get('difficulty', 'unknown')
 
-        print(f"\n{'='*70}")
-        print(f"[{index}/{total}] {case_id}")
-        print(f"类型: {error_type} | 难度: {difficulty}")
-        print(f"{'='*70}")
+        log.append(f"\n{'='*70}")
+        log.append(f"[{index}/{total}] {case_id}")
+        log.append(f"类型: {error_type} | 难度: {difficulty}")
+        log.append(f"{'='*70}")
 
         # 运行测试获取错误
         try:
@@ -86,7 +121,7 @@ class V2BenchmarkTester:
                 timeout=10
             )
         except subprocess.TimeoutExpired:
-            print(f"⏱️  超时（10秒）")
+            log.append(f"⏱️  超时（10秒）")
             return {
                 'case_id': case_id,
                 'error_type': error_type,
@@ -97,7 +132,7 @@ class V2BenchmarkTester:
             }
 
         if result.returncode == 0:
-            print(f"⚠️  程序本身没有错误，跳过")
+            log.append(f"⚠️  程序本身没有错误，跳过")
             return {
                 'case_id': case_id,
                 'error_type': error_type,
@@ -108,26 +143,23 @@ class V2BenchmarkTester:
                 'skipped': True
             }
 
-        print(f"🔍 检测到错误，开始修复...")
+        log.append(f"🔍 检测到错误，开始修复...")
 
         # 使用策略尝试快速修复
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             # 识别错误
-            identifier = ErrorIdentifier()
-            error = identifier.identify(result.stderr)
+            error = self.identifier.identify(result.stderr)
 
-            print(f"   错误类型: {error.error_type}")
-            print(f"   错误文件: {error.error_file}")
+            log.append(f"   错误类型: {error.error_type}")
+            log.append(f"   错误文件: {error.error_file}")
 
             # 获取策略
-            registry = ErrorStrategyRegistry()
-            registry.register_all_defaults()
-            strategy = registry.get(error.error_type)
+            strategy = self.registry.get(error.error_type)
 
             if not strategy:
-                duration = time.time() - start_time
-                print(f"❌ 无对应策略")
+                duration = time.perf_counter() - start_time
+                log.append(f"❌ 无对应策略")
                 return {
                     'case_id': case_id,
                     'error_type': error_type,
@@ -139,26 +171,26 @@ class V2BenchmarkTester:
 
             # 提取错误信息
             extracted = strategy.extract(error.error_message)
-            print(f"   提取信息: {extracted}")
+            log.append(f"   提取信息: {extracted}")
 
-            # 创建 ContextTools
-            context_tools = ContextTools(str(case_dir))
+            # 获取 ContextTools（同一用例目录只建一次索引）
+            context_tools = get_context_tools(str(case_dir))
 
             # 快速搜索
             search_result = strategy.fast_search(extracted, context_tools, error.error_file)
 
             if search_result and search_result.confidence >= 0.7:
-                print(f"   ✅ 快速路径命中 (置信度: {search_result.confidence:.2f})")
+                log.append(f"   ✅ 快速路径命中 (置信度: {search_result.confidence:.2f})")
                 # 这里简化了，实际应该调用修复逻辑
                 # 但为了测试，我们只记录是否找到了高置信度匹配
                 success = True
             else:
                 conf = search_result.confidence if search_result else 0.0
-                print(f"   🔍 需要完整探索 (置信度: {conf:.2f})")
+                log.append(f"   🔍 需要完整探索 (置信度: {conf:.2f})")
                 # 需要 ReAct 完整探索
                 success = False
 
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
 
             result_dict = {
                 'case_id': case_id,
@@ -171,15 +203,15 @@ class V2BenchmarkTester:
             }
 
             if success:
-                print(f"✅ 测试完成 (耗时: {duration:.1f}s)")
+                log.append(f"✅ 测试完成 (耗时: {duration:.1f}s)")
             else:
-                print(f"⚠️  需要完整探索 (耗时: {duration:.1f}s)")
+                log.append(f"⚠️  需要完整探索 (耗时: {duration:.1f}s)")
 
             return result_dict
 
         except Exception as e:
-            duration = time.time() - start_time
-            print(f"❌ 异常: {str(e)[:100]}")
+            duration = time.perf_counter() - start_time
+            log.append(f"❌ 异常: {str(e)[:100]}")
 
             return {
                 'case_id': case_id,
@@ -190,26 +222,41 @@ class V2BenchmarkTester:
                 'error': str(e)[:200]
             }
 
-    def run_batch_test(self, limit: int = None):
-        """批量测试"""
+    def run_batch_test(self, limit: int = None, workers: int = DEFAULT_WORKERS):
+        """批量测试
+
+        Args:
+            limit: 限制测试用例数量
+            workers: 并发线程数（用例间相互独立，耗时主要在子进程中）
+        """
         # 加载测试用例
         test_cases = self.load_test_cases(limit=limit)
+        total = len(test_cases)
 
-        print(f"加载 {len(test_cases)} 个测试用例")
+        print(f"加载 {total} 个测试用例")
         if limit:
             print(f"(限制: {limit} 个)")
 
-        # 运行测试
-        for i, case_info in enumerate(test_cases, 1):
-            result = self.test_single_case(case_info, i, len(test_cases))
+        # 并发运行测试，map 按提交顺序返回结果；
+        # 只有主线程写 stdout，每个用例的日志和当前统计合并为一次写入和刷新
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            outcomes = executor.map(
+                self._collect_case, test_cases, range(1, total + 1), repeat(total)
+            )
+
+            success_count = 0
+            for result, output in outcomes:
 
-            if not result.get('skipped'):
-                self.results.append(result)
+                if not result.get('skipped'):
+                    self.results.append(result)
+                    if result.get('success'):
+                        success_count += 1
 
-            # 显示当前统计
-            if self.results:
-                success_count = sum(1 for r in self.results if r.get('success'))
-                print(f"\n📊 当前统计: {success_count}/{len(self.results)} 成功 ({success_count/len(self.results)*100:.1f}%)")
+                # 显示当前统计（增量计数，无需每次重新遍历全部结果）
+                if self.results:
+                    output += f"\n📊 当前统计: {success_count}/{len(self.results)} 成功 ({success_count/len(self.results)*100:.1f}%)\n"
+                sys.stdout.write(output)
+                sys.stdout.flush()
 
         # 生成报告
         self.generate_report()
@@ -224,16 +271,30 @@ class V2BenchmarkTester:
             print("\n⚠️  无有效测试结果")
             return
 
-        # 整体统计
+        # 单次遍历同时完成整体统计和按错误类型分组
         total = len(self.results)
-        success_count = sum(1 for r in self.results if r.get('success'))
-        success_rate = success_count / total * 100
+        success_count = 0
+        duration_sum = 0
+        confidence_sum = 0
+        by_type = defaultdict(lambda: {'total': 0, 'success': 0, 'durations': [], 'confidences': []})
+        for r in self.results:
+            duration = r.get('duration', 0)
+            confidence = r.get('confidence', 0)
+            stats = by_type[r.get('error_type', 'unknown')]
+
+            stats['total'] += 1
+            stats['durations'].append(duration)
+            stats['confidences'].append(confidence)
+            if r.get('success'):
+                stats['success'] += 1
+                success_count += 1
 
-        durations = [r.get('duration', 0) for r in self.results]
-        avg_duration = sum(durations) / len(durations) if durations else 0
+            duration_sum += duration
+            confidence_sum += confidence
 
-        confidences = [r.get('confidence', 0) for r in self.results]
-        avg_confidence = sum(confidences) / len(confidences) if confidences else 0
+        success_rate = success_count / total * 100
+        avg_duration = duration_sum / total
+        avg_confidence = confidence_sum / total
 
         print(f"\n## 整体表现")
         print(f"   总用例数: {total}")
@@ -242,42 +303,31 @@ class V2BenchmarkTester:
         print(f"   平均耗时: {avg_duration:.1f}秒")
         print(f"   平均置信度: {avg_confidence:.3f}")
 
-        # 按错误类型统计
-        by_type = defaultdict(lambda: {'total': 0, 'success': 0, 'durations': [], 'confidences': []})
-        for r in self.results:
-            error_type = r.get('error_type', 'unknown')
-            by_type[error_type]['total'] += 1
-            if r.get('success'):
-                by_type[error_type]['success'] += 1
-            by_type[error_type]['durations'].append(r.get('duration', 0))
-            by_type[error_type]['confidences'].append(r.get('confidence', 0))
-
         print(f"\n## 按错误类型统计")
         print(f"{'类型':<20s} {'成功率':<20s} {'平均耗时':<12s} {'平均置信度'}")
         print("-" * 70)
         for error_type, stats in sorted(by_type.items()):
             rate = stats['success'] / stats['total'] * 100
-            avg_dur = sum(stats['durations']) / len(stats['durations'])
-            avg_conf = sum(stats['confidences']) / len(stats['confidences'])
+            avg_dur = sum(stats['durations']) / stats['total']
+            avg_conf = sum(stats['confidences']) / stats['total']
             print(f"{error_type:<20s} {stats['success']}/{stats['total']} ({rate:>5.1f}%) {avg_dur:>10.1f}s {avg_conf:>12.3f}")
 
         # 保存结果
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         result_file = f"v2_test_{self.model_name}_{timestamp}.json"
 
-        with open(result_file, 'w') as f:
-            json.dump({
-                'timestamp': timestamp,
-                'model': self.model_name,
-                'base_url': os.getenv('ANTHROPIC_BASE_URL', 'Anthropic Official'),
-                'total': total,
-                'success_count': success_count,
-                'success_rate': success_rate,
-                'avg_duration': avg_duration,
-                'avg_confidence': avg_confidence,
-                'by_type': dict(by_type),
-                'results': self.results
-            }, f, indent=2)
+        dump_json(result_file, {
+            'timestamp': timestamp,
+            'model': self.model_name,
+            'base_url': os.getenv('ANTHROPIC_BASE_URL', 'Anthropic Official'),
+            'total': total,
+            'success_count': success_count,
+            'success_rate': success_rate,
+            'avg_duration': avg_duration,
+            'avg_confidence': avg_confidence,
+            'by_type': dict(by_type),
+            'results': self.results
+        })
 
         print(f"\n✅ 详细结果已保存到: {result_file}")
         return result_file
@@ -289,13 +339,15 @@ def main():
     parser = argparse.ArgumentParser(description='V2 Benchmark 批量测试')
     parser.add_argument('--limit', type=int, help='限制测试用例数量')
     parser.add_argument('--quick', action='store_true', help='快速测试（6个用例）')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'并发线程数（默认为 CPU 核数 {DEFAULT_WORKERS}，1 为串行）')
 
     args = parser.parse_args()
 
     limit = 6 if args.quick else args.limit
 
     tester = V2BenchmarkTester()
-    tester.run_batch_test(limit=limit)
+    tester.run_batch_test(limit=limit, workers=args.workers)
 
 
 if __name__ == "__main__":
@@ -22,6 +22,11 @@ from src.utils.progress_logger import get_progress_logger
 from src.utils.structured_logger import get_structured_logger, DebugPhase, FixMethod
 
 logger = logging.getLogger(__name__)
+
+# 预编译错误消息解析正则
+_NO_MODULE_RE = re.compile(r"No module named ['\"]?([\w.]+)['\"]?")
+_CANNOT_IMPORT_FROM_RE = re.compile(r"cannot import name ['\"](\w+)['\"] from ['\"](\w+)['\"]")
+
 progress = get_progress_logger()
 slog = get_structured_logger()
 
@@ -109,7 +114,6 @@ class DebugAgent:
                 slog.set_fix_method(FixMethod.LLM_CALL)
                 result = await self._fix_single_file(buggy_code, error, max_retries=3)
                 if result.success:
-                    self.code_fixer.save_token_stats()
                     slog.end_session(success=True)
                     return result
                 progress.warning("单文件修复失败，回退到跨文件调查模式...")
@@ -136,7 +140,6 @@ class DebugAgent:
 
             result = await self._retry_fix_loop(buggy_code, error, report, max_retries)
 
-            self.code_fixer.save_token_stats()
             slog.end_phase(success=result.success, attempts=result.attempts)
             slog.end_session(success=result.success)
             return result
@@ -148,6 +151,7 @@ class DebugAgent:
             slog.end_session(success=False)
             raise RuntimeError(f"调试过程失败: {e}") from e
         finally:
+            # 每次调试只在结束时保存一次 token 统计
             try:
                 self.code_fixer.save_token_stats()
             except Exception:
@@ -205,6 +209,7 @@ class DebugAgent:
             else:
                 self._record_attempt(fix_result, current_error, force_llm, success=False,
                                      stderr=exec_result.stderr)
+                self.code_fixer.discard_last_response()
 
                 if fix_result.used_pattern_fixer:
                     force_llm = True
@@ -266,10 +271,10 @@ class DebugAgent:
         if error.error_type in ["ImportError", "ModuleNotFoundError"]:
             progress.progress("检测到导入错误，查找相关模块...")
             try:
-                match = re.search(r"No module named ['\"]?([\w.]+)['\"]?", error.error_message)
+                match = _NO_MODULE_RE.search(error.error_message)
                 if match:
                     module_name = match.group(1)
-                    module_results = self.context_tools.search_module(module_name, fuzzy=True)
+                    module_results = self.context_tools.search_module(module_name, fuzzy=True, limit=1)
                     if module_results and module_results[0]['confidence'] > 0.7:
                         file_path = self.project_path / module_results[0]['file']
                         if file_path.exists():
@@ -292,7 +297,7 @@ class DebugAgent:
             )
 
             progress.progress(f"尝试 {attempt + 1}/{max_retries}: 本地验证中...")
-            exec_result = self.executor.execute(fix_result.fixed_code)
+            exec_result = self._execute_checked(fix_result.fixed_code)
 
             if exec_result.success:
                 progress.success("验证成功！")
@@ -305,6 +310,7 @@ class DebugAgent:
                     related_files=related_files
                 )
             else:
+                self.code_fixer.discard_last_response()
                 if fix_result.used_pattern_fixer:
                     force_llm = True
                 current_code = fix_result.fixed_code
@@ -384,11 +390,47 @@ class DebugAgent:
             fixes = fix_result.related_files.copy()
             if main_filename not in fixes:
                 fixes[main_filename] = fix_result.fixed_code
+            target_file = fix_result.target_file or main_filename
+            syntax_failure = self._precheck_syntax(
+                fixes.get(target_file, ""), self.executor.resolve_path(target_file)
+            )
+            if syntax_failure:
+                return syntax_failure
             return self.executor.execute_with_fixes(
                 main_file=main_filename, fixes=fixes, backup=True
             )
         else:
-            return self.executor.execute(fix_result.fixed_code)
+            return self._execute_checked(fix_result.fixed_code)
+
+    def _execute_checked(self, code: str) -> ExecutionResult:
+        """先做语法预检，语法正确才启动子进程执行"""
+        return (
+            self._precheck_syntax(code, self.executor.temp_file_path())
+            or self.executor.execute(code)
+        )
+
+    def _precheck_syntax(self, code: str, file_path: Path) -> Optional[ExecutionResult]:
+        """廉价的语法预检：修复代码有语法错误时直接返回失败结果，省去一次子进程执行
+
+        file_path 为执行器实际运行的文件路径，生成的 stderr 与解释器报告的格式一致，
+        ErrorIdentifier 能照常解析出出错文件和行号
+        """
+        if not code or file_path.suffix != '.py':
+            return None
+        try:
+            ast.parse(code)
+        except SyntaxError as e:
+            logger.info("修复代码语法错误，跳过执行: line %s: %s", e.lineno, e.msg)
+            stderr = f'  File "{file_path}", line {e.lineno or 1}\n'
+            if e.text and e.text.strip():
+                stderr += f"    {e.text.strip()}\n"
+            # IndentationError / TabError 保留原类型名，与解释器输出一致
+            stderr += f"{type(e).__name__}: {e.msg}"
+            return ExecutionResult(success=False, stderr=stderr, exit_code=1)
+        except ValueError:
+            # 源码含空字节等无法解析的情况，交给解释器执行时报告
+            return None
+        return None
 
     # === 辅助方法 ===
 
@@ -432,12 +474,16 @@ class DebugAgent:
                 pass
 
         parse_and_load(code, "main code")
+        # 每轮只解析上一轮新加入的文件，已解析过的文件不再重复 ast.parse
+        parsed = set()
         for iteration in range(3):
-            files_before = set(related_files.keys())
-            for fname, fcontent in list(related_files.items()):
-                parse_and_load(fcontent, fname)
-            if set(related_files.keys()) == files_before:
+            pending = [(fname, fcontent) for fname, fcontent in related_files.items()
+                       if fname not in parsed]
+            if not pending:
                 break
+            for fname, fcontent in pending:
+                parsed.add(fname)
+                parse_and_load(fcontent, fname)
 
     def _try_load_module(self, module_name: str, related_files: dict):
         """尝试加载模块文件"""
@@ -462,11 +508,11 @@ class DebugAgent:
     def _search_similar_module(self, error, related_files):
         """搜索相似模块"""
         try:
-            match = re.search(r"No module named ['\"]?([\w.]+)['\"]?", error.error_message)
+            match = _NO_MODULE_RE.search(error.error_message)
             if match:
                 module_name = match.group(1)
                 self.context_tools._full_build()
-                matches = self.context_tools.search_module(module_name, fuzzy=True)
+                matches = self.context_tools.search_module(module_name, fuzzy=True, limit=1)
                 if matches and matches[0]['confidence'] > 0.7:
                     found_file = matches[0]['file']
                     found_path = self.project_path / found_file
@@ -511,7 +557,7 @@ class DebugAgent:
 
         # 特殊处理: unknown location 的 ImportError
         if error.error_file == "unknown location" and error.error_type == "ImportError":
-            pkg_match = re.search(r"cannot import name ['\"](\w+)['\"] from ['\"](\w+)['\"]", error.error_message)
+            pkg_match = _CANNOT_IMPORT_FROM_RE.search(error.error_message)
             if pkg_match:
                 package_name = pkg_match.group(2)
                 init_path = self.project_path / package_name / "__init__.py"
@@ -546,7 +592,7 @@ class DebugAgent:
         strategy = self.error_registry.get(error.error_type)
         if strategy:
             try:
-                extracted = strategy.extract(error.error_message)
+                extracted = strategy.extract_cached(error.error_message)
                 if hasattr(strategy, 'get_fix_context'):
                     extra_context = strategy.get_fix_context(
                         extracted, self.context_tools,
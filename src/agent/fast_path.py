@@ -52,7 +52,7 @@ class FastPath:
         if not strategy:
             return traceback_report
 
-        extracted = strategy.extract(error.error_message)
+        extracted = strategy.extract_cached(error.error_message)
         if not extracted:
             return None
 
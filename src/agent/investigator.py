@@ -1,6 +1,7 @@
 """CodebaseInvestigator - ReAct 风格的代码库调查员"""
 import re
 import json
+import asyncio
 import logging
 from enum import Enum, auto
 from dataclasses import dataclass, field
@@ -17,6 +18,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# 标记工具调用尚未执行
+_NOT_EXECUTED = object()
+
 
 class Phase(Enum):
     """调查阶段"""
@@ -151,6 +155,9 @@ Turn 3: complete_investigation(report={
 
 开始调查吧！"""
 
+    # 只读工具：互不依赖、不修改调查状态，同一轮的多个调用可以并发执行
+    READ_ONLY_TOOLS = frozenset({"search_symbol", "read_file", "grep", "get_callers"})
+
     def __init__(self, llm_client, context_tools: "ContextTools"):
         """
         初始化调查员
@@ -228,8 +235,15 @@ Turn 3: complete_investigation(report={
 
                 # 处理工具调用
                 if "tool_calls" in response and response["tool_calls"]:
-                    for tool_call in response["tool_calls"]:
-                        await self._handle_tool_call(tool_call, ctx)
+                    # 每个调用的参数只解析一次，并发预执行和顺序处理共用
+                    parsed_calls = [self._parse_tool_call(tc) for tc in response["tool_calls"]]
+
+                    # 只读工具先并发执行，再按原顺序记录结果
+                    prefetched = await self._run_read_only_tools(parsed_calls)
+                    for i, tool_call in enumerate(response["tool_calls"]):
+                        await self._handle_tool_call(
+                            tool_call, ctx, prefetched.get(i, _NOT_EXECUTED), parsed_calls[i]
+                        )
 
                         # 检查是否完成
                         if ctx.phase == Phase.DONE and ctx.report:
@@ -297,8 +311,8 @@ Turn 3: complete_investigation(report={
 请使用工具继续调查。信息完整后调用 **complete_investigation** 提交报告。
 """
 
-    async def _handle_tool_call(self, tool_call: dict, ctx: LoopContext):
-        """处理工具调用"""
+    def _parse_tool_call(self, tool_call: dict) -> tuple:
+        """解析工具调用，返回 (工具名, 参数 dict)"""
         tool_name = tool_call.get("name") or tool_call.get("function", {}).get("name")
         tool_args = tool_call.get("arguments") or tool_call.get("function", {}).get("arguments", {})
 
@@ -310,7 +324,60 @@ Turn 3: complete_investigation(report={
             except:
                 tool_args = {}
 
-        logger.debug(f"执行工具: {tool_name}({tool_args})")
+        return tool_name, tool_args
+
+    async def _execute_tool(self, tool, tool_args: dict):
+        """执行工具，异常转换为错误结果"""
+        try:
+            return await tool.execute(**tool_args)
+        except Exception as e:
+            logger.error(f"工具执行失败: {e}", exc_info=True)
+            return {"error": str(e)}
+
+    async def _run_read_only_tools(self, parsed_calls: List[tuple]) -> dict:
+        """并发执行同一轮中的只读工具调用
+
+        Args:
+            parsed_calls: 已解析的 (工具名, 参数) 列表
+
+        Returns:
+            {tool_call 下标: 执行结果}；不足两个只读调用时返回空字典，交由顺序处理
+        """
+        jobs = {}
+        for i, (tool_name, tool_args) in enumerate(parsed_calls):
+            if tool_name not in self.READ_ONLY_TOOLS:
+                continue
+            tool = self.tool_registry.get(tool_name)
+            if tool:
+                jobs[i] = self._execute_tool(tool, tool_args)
+
+        if len(jobs) < 2:
+            for job in jobs.values():
+                job.close()  # 未调度的协程直接关闭，避免告警
+            return {}
+
+        logger.debug(f"并发执行 {len(jobs)} 个只读工具调用")
+        results = await asyncio.gather(*jobs.values())
+        return dict(zip(jobs.keys(), results))
+
+    async def _handle_tool_call(
+        self,
+        tool_call: dict,
+        ctx: LoopContext,
+        result=_NOT_EXECUTED,
+        parsed: Optional[tuple] = None
+    ):
+        """处理工具调用
+
+        Args:
+            tool_call: LLM 返回的工具调用
+            ctx: 循环上下文
+            result: 已并发执行得到的结果（未执行时在此执行）
+            parsed: 已解析的 (工具名, 参数)，None 时在此解析
+        """
+        tool_name, tool_args = parsed or self._parse_tool_call(tool_call)
+
+        logger.debug("执行工具: %s(%s)", tool_name, tool_args)
 
         tool = self.tool_registry.get(tool_name)
         if not tool:
@@ -323,11 +390,8 @@ Turn 3: complete_investigation(report={
             return result
 
         # 执行工具
-        try:
-            result = await tool.execute(**tool_args)
-        except Exception as e:
-            logger.error(f"工具执行失败: {e}", exc_info=True)
-            result = {"error": str(e)}
+        if result is _NOT_EXECUTED:
+            result = await self._execute_tool(tool, tool_args)
 
         # 特殊处理
         if tool_name == "complete_investigation":
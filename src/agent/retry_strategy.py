@@ -8,7 +8,7 @@ from dataclasses import dataclass, field
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class AttemptRecord:
     """单次尝试记录"""
     error_type: str
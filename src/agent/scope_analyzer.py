@@ -10,22 +10,26 @@ from src.models.error_context import ErrorContext
 logger = logging.getLogger(__name__)
 
 
-def _levenshtein_distance(s1: str, s2: str) -> int:
-    """计算两个字符串的编辑距离"""
-    if len(s1) < len(s2):
-        return _levenshtein_distance(s2, s1)
-    if len(s2) == 0:
-        return len(s1)
-    previous_row = range(len(s2) + 1)
-    for i, c1 in enumerate(s1):
-        current_row = [i + 1]
-        for j, c2 in enumerate(s2):
-            insertions = previous_row[j + 1] + 1
-            deletions = current_row[j] + 1
-            substitutions = previous_row[j] + (c1 != c2)
-            current_row.append(min(insertions, deletions, substitutions))
-        previous_row = current_row
-    return previous_row[-1]
+try:
+    # 优先使用 C 扩展实现，热路径上比纯 Python 双重循环快一个数量级
+    from Levenshtein import distance as _levenshtein_distance
+except ImportError:
+    def _levenshtein_distance(s1: str, s2: str) -> int:
+        """计算两个字符串的编辑距离"""
+        if len(s1) < len(s2):
+            return _levenshtein_distance(s2, s1)
+        if len(s2) == 0:
+            return len(s1)
+        previous_row = range(len(s2) + 1)
+        for i, c1 in enumerate(s1):
+            current_row = [i + 1]
+            for j, c2 in enumerate(s2):
+                insertions = previous_row[j + 1] + 1
+                deletions = current_row[j] + 1
+                substitutions = previous_row[j] + (c1 != c2)
+                current_row.append(min(insertions, deletions, substitutions))
+            previous_row = current_row
+        return previous_row[-1]
 
 
 # 常见标准库模块列表
@@ -113,7 +117,7 @@ class ScopeAnalyzer:
 
             # 项目中相似模块
             try:
-                results = self.context_tools.search_module(missing_module, fuzzy=True)
+                results = self.context_tools.search_module(missing_module, fuzzy=True, limit=1)
                 if results and results[0]['confidence'] > 0.7:
                     return True
             except Exception:
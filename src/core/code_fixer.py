@@ -2,13 +2,15 @@
 import json
 import re
 import logging
+from pathlib import Path
 from typing import Optional, Dict, Any, List
 from openai import AsyncOpenAI
 
 from src.models.results import FixResult
 from src.utils.config import get_settings
 from src.core.pattern_fixer import PatternFixer
-from src.core.llm_cache import LLMCache
+from src.core.llm_cache import get_llm_cache
+from src.core.response_cache import ResponseCache, get_response_cache
 from src.core.llm_error_handler import (
     call_llm_with_retry,
     LLMError,
@@ -28,7 +30,9 @@ class CodeFixer:
         api_key: Optional[str] = None,
         model: str = "deepseek-chat",
         temperature: float = 0.3,
-        max_tokens: int = 2000
+        max_tokens: int = 2000,
+        json_mode: bool = True,
+        response_cache: Optional[ResponseCache] = None
     ):
         """
         初始化 CodeFixer
@@ -38,6 +42,8 @@ class CodeFixer:
             model: 模型名称
             temperature: 温度参数（0-1，越低越确定）
             max_tokens: 最大 token 数
+            json_mode: 是否要求 LLM 以 JSON 对象格式输出（不支持的服务可关闭）
+            response_cache: LLM 原始响应缓存，None 时按配置 llm_response_cache_path 决定是否启用
         """
         settings = get_settings()
 
@@ -45,6 +51,7 @@ class CodeFixer:
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self.json_mode = json_mode
 
         # 创建 OpenAI 客户端
         self.client = AsyncOpenAI(
@@ -56,7 +63,14 @@ class CodeFixer:
         self.pattern_fixer = PatternFixer()
 
         # LLM 响应缓存
-        self.cache = LLMCache()
+        self.cache = get_llm_cache()
+
+        # LLM 原始响应缓存（可选，完全相同的请求直接复用响应）
+        if response_cache is None and settings.llm_response_cache_path:
+            response_cache = get_response_cache(Path(settings.llm_response_cache_path))
+        self.response_cache = response_cache
+        # 最近一次 fix_code 使用的响应缓存键，修复未通过验证时据此删除该响应
+        self._last_response_key: Optional[str] = None
 
         # Token 使用统计
         self.token_stats = {
@@ -68,6 +82,8 @@ class CodeFixer:
             "pattern_hits": 0,
             "tokens_saved_by_cache": 0  # 估算：每次缓存命中省约 2500 tokens
         }
+        # 已累加进统计文件的部分，保存时只写入增量
+        self._saved_token_stats = dict.fromkeys(self.token_stats, 0)
 
         logger.info(f"CodeFixer 初始化: model={self.model}, 缓存条目: {len(self.cache._cache)}")
 
@@ -97,6 +113,8 @@ class CodeFixer:
             ValueError: 输入验证失败
             RuntimeError: LLM 调用失败
         """
+        self._last_response_key = None
+
         # 验证输入
         if not buggy_code or not isinstance(buggy_code, str):
             raise ValueError("buggy_code 必须是非空字符串")
@@ -136,37 +154,63 @@ class CodeFixer:
         # 构建提示
         prompt = self._build_prompt(buggy_code, error_message, context, rag_solutions)
 
+        messages = [
+            {
+                "role": "system",
+                "content": "你是专业的 Python 代码修复专家。请仔细分析错误并生成修复后的代码。"
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+        # 结构化输出：一次调用直接得到可解析的 JSON
+        response_format = {"type": "json_object"} if self.json_mode else None
+
         try:
-            # 调用 LLM（带重试机制）
-            response = await call_llm_with_retry(
-                client=self.client,
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "你是专业的 Python 代码修复专家。请仔细分析错误并生成修复后的代码。"
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-                max_retries=3,
-                timeout=60.0
-            )
+            # 完全相同的请求之前已有响应时直接复用
+            content = None
+            cache_key = None
+            if self.response_cache:
+                cache_key = ResponseCache.make_key(
+                    self.model, messages,
+                    temperature=self.temperature,
+                    max_tokens=self.max_tokens,
+                    response_format=response_format
+                )
+                content = self.response_cache.get(cache_key)
+                if content is not None:
+                    logger.info("💾 LLM 响应缓存命中，跳过调用")
+                    self.token_stats["cache_hits"] += 1
+
+            if content is None:
+                # 调用 LLM（带重试机制）
+                response = await call_llm_with_retry(
+                    client=self.client,
+                    model=self.model,
+                    messages=messages,
+                    temperature=self.temperature,
+                    max_tokens=self.max_tokens,
+                    max_retries=3,
+                    timeout=60.0,
+                    response_format=response_format
+                )
+
+                # 记录 token 使用
+                if hasattr(response, 'usage') and response.usage:
+                    self.token_stats["total_prompt_tokens"] += response.usage.prompt_tokens
+                    self.token_stats["total_completion_tokens"] += response.usage.completion_tokens
+                    self.token_stats["total_tokens"] += response.usage.total_tokens
+                    self.token_stats["llm_calls"] += 1
+                    logger.info(f"📊 Token 使用: {response.usage.total_tokens} (prompt: {response.usage.prompt_tokens}, completion: {response.usage.completion_tokens})")
+
+                content = response.choices[0].message.content
+                if cache_key and content:
+                    self.response_cache.put(cache_key, content)
 
-            # 记录 token 使用
-            if hasattr(response, 'usage') and response.usage:
-                self.token_stats["total_prompt_tokens"] += response.usage.prompt_tokens
-                self.token_stats["total_completion_tokens"] += response.usage.completion_tokens
-                self.token_stats["total_tokens"] += response.usage.total_tokens
-                self.token_stats["llm_calls"] += 1
-                logger.info(f"📊 Token 使用: {response.usage.total_tokens} (prompt: {response.usage.prompt_tokens}, completion: {response.usage.completion_tokens})")
+            self._last_response_key = cache_key
 
             # 解析响应
-            content = response.choices[0].message.content
             result = self._parse_response(content, buggy_code)
 
             # 存入缓存
@@ -336,22 +380,32 @@ class CodeFixer:
 
     def _parse_response(self, content: str, original_code: str) -> FixResult:
         """解析 LLM 响应"""
+        content = content or ""
         try:
-            # 1. 尝试提取 JSON 代码块
-            json_match = re.search(r'```json\s*\n(.*?)\n```', content, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-                data = json.loads(json_str)
-            else:
-                # 2. 尝试直接解析 JSON
-                # 查找第一个 { 和最后一个 }
-                start = content.find('{')
-                end = content.rfind('}')
-                if start != -1 and end != -1:
-                    json_str = content[start:end+1]
+            # 0. JSON 模式下响应本身就是 JSON 对象，直接解析
+            data = None
+            if content.lstrip().startswith('{'):
+                try:
+                    data = json.loads(content)
+                except json.JSONDecodeError:
+                    data = None
+
+            if data is None:
+                # 1. 尝试提取 JSON 代码块
+                json_match = re.search(r'```json\s*\n(.*?)\n```', content, re.DOTALL)
+                if json_match:
+                    json_str = json_match.group(1)
                     data = json.loads(json_str)
                 else:
-                    raise ValueError("未找到 JSON 内容")
+                    # 2. 尝试直接解析 JSON
+                    # 查找第一个 { 和最后一个 }
+                    start = content.find('{')
+                    end = content.rfind('}')
+                    if start != -1 and end != -1:
+                        json_str = content[start:end+1]
+                        data = json.loads(json_str)
+                    else:
+                        raise ValueError("未找到 JSON 内容")
 
             # 提取字段
             fixed_code = data.get("fixed_code", "")
@@ -410,9 +464,28 @@ class CodeFixer:
             stats["savings_percent"] = 0
         return stats
 
+    def discard_last_response(self):
+        """最近一次修复未通过验证时调用：删除对应的缓存响应
+
+        否则重试时相同的请求会再次命中缓存，拿回同一个失败的修复
+        """
+        if self.response_cache and self._last_response_key:
+            self.response_cache.delete(self._last_response_key)
+            logger.info("修复未通过验证，已删除对应的 LLM 响应缓存")
+        self._last_response_key = None
+
     def save_token_stats(self):
-        """保存 token 统计到文件"""
-        from pathlib import Path
+        """保存 token 统计到文件
+
+        只累加上次保存之后新增的部分，没有新增时不读写文件
+        """
+        delta = {
+            key: value - self._saved_token_stats[key]
+            for key, value in self.token_stats.items()
+        }
+        if not any(delta.values()):
+            return
+
         stats_file = Path(".debug_agent_cache/token_stats.json")
         stats_file.parent.mkdir(exist_ok=True)
 
@@ -425,9 +498,9 @@ class CodeFixer:
                 pass
 
         # 累加统计
-        for key in ["total_prompt_tokens", "total_completion_tokens", "total_tokens",
-                    "llm_calls", "cache_hits", "pattern_hits", "tokens_saved_by_cache"]:
-            existing[key] = existing.get(key, 0) + self.token_stats[key]
+        for key, value in delta.items():
+            existing[key] = existing.get(key, 0) + value
 
         stats_file.write_text(json.dumps(existing, indent=2), encoding='utf-8')
+        self._saved_token_stats = self.token_stats.copy()
         logger.info(f"Token 统计已保存: {existing}")
@@ -7,12 +7,19 @@ from src.models.error_context import ErrorContext
 
 logger = logging.getLogger(__name__)
 
+# 预编译 traceback 解析正则（每次 identify 都会用到）
+_ERROR_LINE_RE = re.compile(r'^(\w+(?:Error|Exception)):\s*(.+)$')
+_FILE_LINE_RE = re.compile(r'File\s+"([^"]+)",\s+line\s+(\d+)')
+_CANNOT_IMPORT_RE = re.compile(
+    r"cannot import name ['\"](\w+)['\"] from ['\"](\w+)['\"] \(([^)]+)\)"
+)
+
 
 class ErrorIdentifier:
     """从 traceback 中识别错误信息"""
 
-    # 常见错误类型
-    ERROR_TYPES = [
+    # 常见错误类型（frozenset，按行做 O(1) 成员判断）
+    ERROR_TYPES = frozenset({
         "NameError",
         "ImportError",
         "ModuleNotFoundError",
@@ -24,7 +31,7 @@ class ErrorIdentifier:
         "FileNotFoundError",
         "ZeroDivisionError",
         "SyntaxError"
-    ]
+    })
 
     def identify(self, traceback: str) -> ErrorContext:
         """
@@ -79,7 +86,7 @@ class ErrorIdentifier:
 
             # 匹配错误类型: 错误消息
             # 例如: NameError: name 'x' is not defined
-            match = re.match(r'^(\w+(?:Error|Exception)):\s*(.+)$', line)
+            match = _ERROR_LINE_RE.match(line)
             if match:
                 error_type = match.group(1)
                 error_message = match.group(2).strip()
@@ -87,9 +94,8 @@ class ErrorIdentifier:
 
             # 有些错误没有消息，只有类型
             # 例如: KeyboardInterrupt
-            for err_type in self.ERROR_TYPES:
-                if line == err_type:
-                    return err_type, ""
+            if line in self.ERROR_TYPES:
+                return line, ""
 
         # 未找到错误类型
         logger.warning("无法从 traceback 中提取错误类型，使用 UnknownError")
@@ -115,17 +121,14 @@ class ErrorIdentifier:
         for line in lines:
             # 匹配文件和行号
             # File "main.py", line 10
-            match = re.search(r'File\s+"([^"]+)",\s+line\s+(\d+)', line)
+            match = _FILE_LINE_RE.search(line)
             if match:
                 last_file = match.group(1)
                 last_line = int(match.group(2))
 
         # 特殊处理：ImportError: cannot import name 'X' from 'module' (/path/to/module.py)
         # 这种情况下，实际错误在被导入的模块中，而不是执行import的文件
-        import_error_match = re.search(
-            r"cannot import name ['\"](\w+)['\"] from ['\"](\w+)['\"] \(([^)]+)\)",
-            traceback
-        )
+        import_error_match = _CANNOT_IMPORT_RE.search(traceback)
         if import_error_match:
             target_module_path = import_error_match.group(3)
             logger.debug(f"ImportError 特殊处理: 实际错误在 {target_module_path}")
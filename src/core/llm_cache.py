@@ -1,16 +1,49 @@
 """LLM 响应缓存 - 基于错误模式复用修复策略"""
-import json
+import atexit
 import hashlib
+import heapq
 import logging
+import re
 import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Dict, Any
 from dataclasses import dataclass, asdict
 
+from src.utils.json_io import dumps_bytes, loads, write_json_atomic
+
 logger = logging.getLogger(__name__)
 
+# 错误模式泛化规则（按顺序替换），模块加载时预编译
+_PATTERN_SUBS = (
+    (re.compile(r"name '(\w+)'"), "name '<VAR>'"),                  # 变量名
+    (re.compile(r"module named '([\w.]+)'"), "module named '<MOD>'"),  # 模块名
+    (re.compile(r"attribute '(\w+)'"), "attribute '<ATTR>'"),        # 属性名
+    (re.compile(r"KeyError: '(\w+)'"), "KeyError: '<KEY>'"),          # 键名
+    (re.compile(r'File "([^"]+)"'), 'File "<FILE>"'),                 # 文件路径
+    (re.compile(r'line \d+'), 'line <N>'),                            # 行号
+)
+
+
+def _generalize(error_message: str) -> str:
+    """依次应用泛化规则，把具体名称替换为占位符"""
+    for regex, replacement in _PATTERN_SUBS:
+        error_message = regex.sub(replacement, error_message)
+    return error_message
 
-@dataclass
+
+@lru_cache(maxsize=1024)
+def _pattern_key(error_type: str, error_message: str) -> str:
+    """由错误类型和泛化后的错误模式生成缓存键
+
+    同一错误在 get/put/mark_failed 中会反复计算键，按原始消息记忆化
+    """
+    pattern = _generalize(error_message)
+    content = f"{error_type}:{pattern}"
+    return hashlib.md5(content.encode()).hexdigest()[:16]
+
+
+@dataclass(slots=True)
 class CacheEntry:
     """缓存条目"""
     error_pattern: str      # 错误模式 (类型+关键信息)
@@ -50,7 +83,10 @@ class LLMCache:
         self.cache_dir = cache_dir or Path(".debug_agent_cache")
         self.cache_dir.mkdir(exist_ok=True)
         self.cache_file = self.cache_dir / "llm_cache.json"
+        # 增量日志：每次更新只追加一行，定期合并回 cache_file
+        self.journal_file = self.cache_dir / "llm_cache.jsonl"
         self.max_entries = max_entries
+        self._journal_lines = 0
 
         # 内存缓存
         self._cache: Dict[str, CacheEntry] = {}
@@ -62,20 +98,70 @@ class LLMCache:
         """从磁盘加载缓存"""
         if self.cache_file.exists():
             try:
-                data = json.loads(self.cache_file.read_text(encoding='utf-8'))
+                data = loads(self.cache_file.read_bytes())
                 for key, entry_data in data.items():
                     self._cache[key] = CacheEntry(**entry_data)
             except Exception as e:
                 logger.warning(f"加载缓存失败: {e}")
 
+        # 回放增量日志（后写入的记录覆盖先前的）
+        if self.journal_file.exists():
+            try:
+                lines = self.journal_file.read_bytes().splitlines()
+            except OSError as e:
+                logger.warning(f"读取缓存日志失败: {e}")
+                lines = []
+            for lineno, line in enumerate(lines, 1):
+                if not line.strip():
+                    continue
+                # 进程在追加时被终止会留下截断的行，跳过该行，继续回放后续记录
+                try:
+                    record = loads(line)
+                    key = record.pop("key")
+                    self._cache[key] = CacheEntry(**record)
+                except Exception as e:
+                    logger.warning(f"跳过无法解析的缓存日志第 {lineno} 行: {e}")
+                    continue
+                self._journal_lines += 1
+
     def _save_cache(self):
-        """保存缓存到磁盘"""
+        """保存完整快照到磁盘，并清空增量日志
+
+        先完整序列化再一次写入临时文件并原子替换，写入中断不会损坏已有缓存
+        """
         try:
             data = {k: asdict(v) for k, v in self._cache.items()}
-            self.cache_file.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+            write_json_atomic(self.cache_file, data)
+            self.journal_file.unlink(missing_ok=True)
+            self._journal_lines = 0
         except Exception as e:
             logger.warning(f"保存缓存失败: {e}")
 
+    def _append_journal(self, key: str, entry: CacheEntry):
+        """追加一条更新记录，避免每次更新都重写整个缓存文件
+
+        日志行数超过当前条目数（至少 100）时合并为快照
+        """
+        try:
+            record = {"key": key, **asdict(entry)}
+            with open(self.journal_file, 'ab') as f:
+                f.write(dumps_bytes(record, indent=False) + b"\n")
+            self._journal_lines += 1
+        except Exception as e:
+            logger.warning(f"写入缓存日志失败: {e}")
+            return
+
+        if self._journal_lines > max(len(self._cache), 100):
+            self._save_cache()
+
+    def flush_snapshot(self):
+        """将增量日志合并写入快照文件（日志为空时不做任何事）
+
+        全局实例在进程退出时自动调用，下次启动无需回放日志
+        """
+        if self._journal_lines:
+            self._save_cache()
+
     def _generate_key(self, error_type: str, error_message: str, code_context: str = "") -> str:
         """
         生成缓存键
@@ -83,12 +169,7 @@ class LLMCache:
         基于错误类型和关键特征生成唯一键，
         忽略具体变量名等细节，只保留模式。
         """
-        # 提取错误模式（忽略具体名称）
-        pattern = self._extract_pattern(error_type, error_message)
-
-        # 生成哈希
-        content = f"{error_type}:{pattern}"
-        return hashlib.md5(content.encode()).hexdigest()[:16]
+        return _pattern_key(error_type, error_message)
 
     def _extract_pattern(self, error_type: str, error_message: str) -> str:
         """
@@ -98,29 +179,7 @@ class LLMCache:
         - "name 'foo' is not defined" -> "name '<VAR>' is not defined"
         - "No module named 'maath'" -> "No module named '<MOD>'"
         """
-        import re
-
-        pattern = error_message
-
-        # 泛化变量名
-        pattern = re.sub(r"name '(\w+)'", "name '<VAR>'", pattern)
-
-        # 泛化模块名
-        pattern = re.sub(r"module named '([\w.]+)'", "module named '<MOD>'", pattern)
-
-        # 泛化属性名
-        pattern = re.sub(r"attribute '(\w+)'", "attribute '<ATTR>'", pattern)
-
-        # 泛化键名
-        pattern = re.sub(r"KeyError: '(\w+)'", "KeyError: '<KEY>'", pattern)
-
-        # 泛化文件路径
-        pattern = re.sub(r'File "([^"]+)"', 'File "<FILE>"', pattern)
-
-        # 泛化行号
-        pattern = re.sub(r'line \d+', 'line <N>', pattern)
-
-        return pattern
+        return _generalize(error_message)
 
     def get(self, error_type: str, error_message: str, code_context: str = "") -> Optional[CacheEntry]:
         """
@@ -185,11 +244,12 @@ class LLMCache:
             )
             self._cache[key] = entry
 
-        # 如果超过最大条目数，清理旧条目
+        # 如果超过最大条目数，清理旧条目（删除无法用追加日志表达，直接写快照）
         if len(self._cache) > self.max_entries:
             self._cleanup()
-
-        self._save_cache()
+            self._save_cache()
+        else:
+            self._append_journal(key, entry)
         logger.debug(f"缓存已添加: {error_type}")
 
     def mark_failed(self, error_type: str, error_message: str, code_context: str = ""):
@@ -198,18 +258,17 @@ class LLMCache:
 
         if key in self._cache:
             self._cache[key].fail_count += 1
-            self._save_cache()
+            self._append_journal(key, self._cache[key])
             logger.debug(f"缓存标记失败: {error_type}")
 
     def _cleanup(self):
         """清理旧缓存条目"""
-        # 按最后使用时间排序，删除最旧的 20%
-        sorted_keys = sorted(
-            self._cache.keys(),
+        # 删除最后使用时间最早的 20%（只选出这部分，不对全部条目排序）
+        to_remove = heapq.nsmallest(
+            len(self._cache) // 5,
+            self._cache,
             key=lambda k: self._cache[k].last_used
         )
-
-        to_remove = sorted_keys[:len(sorted_keys) // 5]
         for key in to_remove:
             del self._cache[key]
 
@@ -230,3 +289,24 @@ class LLMCache:
             "hit_rate": total_success / (total_success + total_fail) if (total_success + total_fail) > 0 else 0,
             "avg_confidence": sum(e.confidence for e in self._cache.values()) / len(self._cache)
         }
+
+
+# 全局实例（按缓存目录区分）
+_cache_instances: Dict[Path, LLMCache] = {}
+
+
+def get_llm_cache(cache_dir: Optional[Path] = None) -> LLMCache:
+    """获取指定缓存目录的全局缓存实例
+
+    同一进程内多次创建 CodeFixer / DebugAgent 时共用一份内存缓存，
+    避免每次都重新读取并解析缓存文件
+    """
+    # 规范化为绝对路径，相对路径、"./x"、末尾斜杠等写法都命中同一实例
+    key = Path(cache_dir or ".debug_agent_cache").expanduser().resolve()
+    instance = _cache_instances.get(key)
+    if instance is None:
+        instance = LLMCache(cache_dir=key)
+        _cache_instances[key] = instance
+        # 进程退出时把未合并的增量日志写回快照
+        atexit.register(instance.flush_snapshot)
+    return instance
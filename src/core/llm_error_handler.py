@@ -138,7 +138,8 @@ async def call_llm_with_retry(
     temperature: float = 0.3,
     max_tokens: int = 2000,
     max_retries: int = 3,
-    timeout: float = 60.0
+    timeout: float = 60.0,
+    response_format: Optional[dict] = None
 ) -> Any:
     """调用 LLM 并自动重试
 
@@ -150,6 +151,7 @@ async def call_llm_with_retry(
         max_tokens: 最大 token 数
         max_retries: 最大重试次数
         timeout: 超时时间（秒）
+        response_format: 结构化输出格式（如 {"type": "json_object"}），None 表示不限制
 
     Returns:
         LLM 响应
@@ -157,16 +159,20 @@ async def call_llm_with_retry(
     Raises:
         LLMError: LLM 调用失败
     """
+    request_params = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens
+    }
+    if response_format:
+        request_params["response_format"] = response_format
+
     async def _make_request():
         try:
             # 使用 asyncio.wait_for 添加超时控制
             response = await asyncio.wait_for(
-                client.chat.completions.create(
-                    model=model,
-                    messages=messages,
-                    temperature=temperature,
-                    max_tokens=max_tokens
-                ),
+                client.chat.completions.create(**request_params),
                 timeout=timeout
             )
             return response
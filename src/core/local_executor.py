@@ -34,6 +34,14 @@ class LocalExecutor:
         self.timeout = timeout
         logger.info(f"LocalExecutor 初始化: project_path={self.project_path}, timeout={timeout}s")
 
+    def temp_file_path(self, filename: str = "main.py") -> Path:
+        """execute() 写入代码字符串的临时文件路径（即 traceback 中报告的文件路径）"""
+        return self.project_path / f".debug_temp_{filename}"
+
+    def resolve_path(self, file_path: str) -> Path:
+        """解析文件路径，结果与执行时 traceback 中报告的文件路径一致"""
+        return self._resolve_path(file_path)
+
     def _resolve_path(self, file_path: str) -> Path:
         """
         智能解析文件路径
@@ -66,7 +74,7 @@ class LocalExecutor:
                     # 发现重叠，使用绝对路径
                     resolved = self.project_path.parent.joinpath(*project_parts[i:], *file_parts[len(project_parts) - i:])
                     if resolved.exists():
-                        logger.debug(f"路径重叠检测: {file_path} -> {resolved}")
+                        logger.debug("路径重叠检测: %s -> %s", file_path, resolved)
                         return resolved
         except Exception:
             pass
@@ -86,7 +94,7 @@ class LocalExecutor:
             ExecutionResult
         """
         # 写入临时文件
-        temp_file = self.project_path / f".debug_temp_{filename}"
+        temp_file = self.temp_file_path(filename)
         try:
             temp_file.write_text(code, encoding='utf-8')
             result = self.execute_file(str(temp_file))
@@ -132,7 +140,7 @@ class LocalExecutor:
             python_paths.append(str(work_dir))
         env["PYTHONPATH"] = os.pathsep.join(python_paths)
 
-        logger.debug(f"执行文件: {resolved_path}, cwd={work_dir}, PYTHONPATH={env['PYTHONPATH']}")
+        logger.debug("执行文件: %s, cwd=%s, PYTHONPATH=%s", resolved_path, work_dir, env['PYTHONPATH'])
 
         try:
             result = subprocess.run(
@@ -157,7 +165,7 @@ class LocalExecutor:
 
             logger.info(f"执行完成: success={success}, returncode={result.returncode}")
             if not success:
-                logger.debug(f"stderr: {result.stderr[:500]}")
+                logger.debug("stderr: %.500s", result.stderr)
 
             return ExecutionResult(
                 success=success,
@@ -202,6 +210,7 @@ class LocalExecutor:
         """
         backups = {}
         resolved_paths = {}  # 保存解析后的路径，用于回滚
+        ensured_dirs = set()  # 已确认存在的目录，多个文件同目录时只创建一次
 
         try:
             # 1. 备份并写入修复
@@ -214,7 +223,10 @@ class LocalExecutor:
                     backups[file_path] = full_path.read_text(encoding='utf-8')
 
                 # 确保目录存在
-                full_path.parent.mkdir(parents=True, exist_ok=True)
+                parent = full_path.parent
+                if parent not in ensured_dirs:
+                    parent.mkdir(parents=True, exist_ok=True)
+                    ensured_dirs.add(parent)
                 full_path.write_text(fixed_code, encoding='utf-8')
                 logger.info(f"已写入修复: {file_path} -> {full_path}")
 
@@ -25,7 +25,7 @@ class LoopCheckResult:
     escalate_to_layer: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class FixAttempt:
     """修复尝试记录"""
     code_hash: str
@@ -1,12 +1,39 @@
 """PatternFixer - 基于模式的快速修复器（无需LLM）"""
 import re
 import logging
-from typing import Optional, Tuple, List
+from typing import Dict, Optional, Tuple, List
 from difflib import get_close_matches
 
+try:
+    from rapidfuzz import fuzz, process as _rf_process
+except ImportError:
+    _rf_process = None
+
 logger = logging.getLogger(__name__)
 
 
+def _closest_match(word: str, candidates, cutoff: float = 0.8) -> Optional[str]:
+    """返回与 word 最相似的候选名称，相似度低于 cutoff 时返回 None
+
+    结果始终以 difflib 为准（包括同分时的取舍），与是否安装 rapidfuzz 无关。
+    rapidfuzz 的 fuzz.ratio 基于最长公共子序列，不低于 difflib 的 ratio，
+    安装时先用它的 C++ 实现筛掉不可能达到 cutoff 的候选，再交给 difflib 确认
+    """
+    if _rf_process is not None:
+        # 留一点余量，避免浮点误差把恰好达到 cutoff 的候选筛掉
+        candidates = [
+            choice for choice, _, _ in _rf_process.extract(
+                word, candidates, scorer=fuzz.ratio, processor=None,
+                score_cutoff=cutoff * 100 - 1e-6, limit=None
+            )
+        ]
+        if not candidates:
+            return None
+
+    similar = get_close_matches(word, candidates, n=1, cutoff=cutoff)
+    return similar[0] if similar else None
+
+
 class PatternFixer:
     """
     基于规则的快速修复器
@@ -200,9 +227,8 @@ class PatternFixer:
 
         # 2. 从代码中找相似的已定义名称
         defined_names = self._extract_defined_names(code)
-        similar = get_close_matches(undefined_name, defined_names, n=1, cutoff=0.8)
-        if similar:
-            correct = similar[0]
+        correct = _closest_match(undefined_name, defined_names)
+        if correct:
             fixed_code = re.sub(rf'\b{undefined_name}\b', correct, code)
             return fixed_code, f"修复变量名拼写: {undefined_name} → {correct}"
 
@@ -211,7 +237,8 @@ class PatternFixer:
     def _fix_attribute_error(self, code: str, error_message: str) -> Optional[Tuple[str, str]]:
         """修复 AttributeError - 扫描并修复所有已知的属性拼写错误"""
         fixed_code = code
-        fixes = []
+        # 保持插入顺序的去重集合（dict），避免每次追加前线性查找已有记录
+        fixes: Dict[str, None] = {}
 
         # 1. 先修复错误消息中提到的错误
         match = re.search(r"has no attribute ['\"](\w+)['\"]", error_message)
@@ -224,20 +251,19 @@ class PatternFixer:
                 correct = suggest_match.group(1)
                 if f'.{wrong_attr}' in fixed_code:
                     fixed_code = re.sub(rf'\.{wrong_attr}\b', f'.{correct}', fixed_code)
-                    fixes.append(f"{wrong_attr} → {correct}")
+                    fixes[f"{wrong_attr} → {correct}"] = None
 
             # 检查常见拼写错误
             elif wrong_attr in self.COMMON_ATTR_TYPOS:
                 correct = self.COMMON_ATTR_TYPOS[wrong_attr]
                 fixed_code = re.sub(rf'\.{wrong_attr}\b', f'.{correct}', fixed_code)
-                fixes.append(f"{wrong_attr} → {correct}")
+                fixes[f"{wrong_attr} → {correct}"] = None
 
         # 2. 扫描并修复所有其他已知的属性拼写错误
         for wrong, correct in self.COMMON_ATTR_TYPOS.items():
             if f'.{wrong}' in fixed_code:
                 fixed_code = re.sub(rf'\.{wrong}\b', f'.{correct}', fixed_code)
-                if f"{wrong} → {correct}" not in fixes:
-                    fixes.append(f"{wrong} → {correct}")
+                fixes[f"{wrong} → {correct}"] = None
 
         # 3. 扫描常见的字符串方法拼写错误（扩展列表）
         extra_typos = {
@@ -277,8 +303,7 @@ class PatternFixer:
         for wrong, correct in extra_typos.items():
             if f'.{wrong}' in fixed_code:
                 fixed_code = re.sub(rf'\.{wrong}\b', f'.{correct}', fixed_code)
-                if f"{wrong} → {correct}" not in fixes:
-                    fixes.append(f"{wrong} → {correct}")
+                fixes[f"{wrong} → {correct}"] = None
 
         if fixes and fixed_code != code:
             return fixed_code, f"修复属性名拼写: {', '.join(fixes)}"
@@ -288,7 +313,8 @@ class PatternFixer:
     def _fix_import_error(self, code: str, error_message: str) -> Optional[Tuple[str, str]]:
         """修复 ImportError/ModuleNotFoundError - 扫描并修复所有已知的模块拼写错误"""
         fixed_code = code
-        fixes = []
+        # 保持插入顺序的去重集合（dict），避免每次追加前线性查找已有记录
+        fixes: Dict[str, None] = {}
 
         # 1. 扫描并修复所有已知的标准库拼写错误
         for wrong, correct in self.STDLIB_MODULES.items():
@@ -296,13 +322,11 @@ class PatternFixer:
             if re.search(rf'\bimport\s+{wrong}\b', fixed_code):
                 fixed_code = re.sub(rf'\bimport\s+{wrong}\b', f'import {correct}', fixed_code)
                 fixed_code = re.sub(rf'\b{wrong}\.', f'{correct}.', fixed_code)  # 修复使用处
-                if f"{wrong} → {correct}" not in fixes:
-                    fixes.append(f"{wrong} → {correct}")
+                fixes[f"{wrong} → {correct}"] = None
             # 检查 from xxx import
             if re.search(rf'\bfrom\s+{wrong}\b', fixed_code):
                 fixed_code = re.sub(rf'\bfrom\s+{wrong}\b', f'from {correct}', fixed_code)
-                if f"{wrong} → {correct}" not in fixes:
-                    fixes.append(f"{wrong} → {correct}")
+                fixes[f"{wrong} → {correct}"] = None
 
         # 2. 扩展的模块拼写错误列表
         extra_module_typos = {
@@ -321,12 +345,10 @@ class PatternFixer:
             if re.search(rf'\bimport\s+{wrong}\b', fixed_code):
                 fixed_code = re.sub(rf'\bimport\s+{wrong}\b', f'import {correct}', fixed_code)
                 fixed_code = re.sub(rf'\b{wrong}\.', f'{correct}.', fixed_code)
-                if f"{wrong} → {correct}" not in fixes:
-                    fixes.append(f"{wrong} → {correct}")
+                fixes[f"{wrong} → {correct}"] = None
             if re.search(rf'\bfrom\s+{wrong}\b', fixed_code):
                 fixed_code = re.sub(rf'\bfrom\s+{wrong}\b', f'from {correct}', fixed_code)
-                if f"{wrong} → {correct}" not in fixes:
-                    fixes.append(f"{wrong} → {correct}")
+                fixes[f"{wrong} → {correct}"] = None
 
         if fixes and fixed_code != code:
             return fixed_code, f"修复模块名拼写: {', '.join(fixes)}"
@@ -364,9 +386,8 @@ class PatternFixer:
             # 字典访问: data['key']
             defined_keys.update(re.findall(r"\[['\"](\w+)['\"]\]", code))
 
-            similar = get_close_matches(wrong_key, list(defined_keys), n=1, cutoff=0.8)
-            if similar:
-                correct = similar[0]
+            correct = _closest_match(wrong_key, list(defined_keys))
+            if correct:
                 fixed_code = re.sub(rf"\[(['\"]){wrong_key}\1\]", f"['{correct}']", fixed_code)
                 fixed_code = re.sub(rf"\.get\s*\(\s*(['\"]){wrong_key}\1", f".get('{correct}'", fixed_code)
                 if fixed_code != code:
@@ -0,0 +1,99 @@
+"""LLM 原始响应持久化缓存 - 基于 SQLite，跨进程/多次运行复用完全相同请求的响应"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    LLM 响应缓存（按完整请求参数精确匹配）
+
+    与 LLMCache（按错误模式泛化、存修复策略）不同，这里缓存的是
+    相同 model + messages + 采样参数 的原始响应文本，主要用于反复跑
+    benchmark / 评测时跳过已经请求过的 LLM 调用。
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        初始化缓存
+
+        Args:
+            db_path: SQLite 数据库文件路径
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # 连接在线程间共享，写操作用锁串行化
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.db_path), isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, content TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+
+        logger.info(f"LLM 响应缓存: {self.db_path}")
+
+    @staticmethod
+    def make_key(model: str, messages: list, **params) -> str:
+        """由请求参数生成缓存键（参数顺序无关）"""
+        payload = json.dumps(
+            {"model": model, "messages": messages, "params": params},
+            ensure_ascii=False, sort_keys=True
+        )
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """查找缓存的响应内容，未命中返回 None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, content: str):
+        """写入响应内容"""
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, content, created_at) VALUES (?, ?, ?)",
+                    (key, content, time.time())
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"写入响应缓存失败: {e}")
+
+    def delete(self, key: str):
+        """删除响应（如该响应生成的修复未通过验证）"""
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            logger.warning(f"删除响应缓存失败: {e}")
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+
+# 全局实例（按数据库路径区分）
+_response_caches = {}
+
+
+def get_response_cache(db_path: Path) -> ResponseCache:
+    """获取指定数据库路径的全局响应缓存实例"""
+    key = Path(db_path).expanduser().resolve()
+    instance = _response_caches.get(key)
+    if instance is None:
+        instance = ResponseCache(key)
+        _response_caches[key] = instance
+    return instance
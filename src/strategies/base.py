@@ -18,6 +18,8 @@ class BaseErrorStrategy(ABC):
             confidence_threshold: 置信度阈值 (0.0-1.0)，默认 0.7
         """
         self.confidence_threshold = confidence_threshold
+        # extract 结果缓存：同一错误消息在快速路径和修复上下文中会各解析一次
+        self._extract_cache: dict = {}
 
     @property
     @abstractmethod
@@ -38,6 +40,24 @@ class BaseErrorStrategy(ABC):
         """
         pass
 
+    def extract_cached(self, error_message: str) -> dict:
+        """
+        带缓存的 extract，同一错误消息只解析一次
+
+        Args:
+            error_message: 错误消息
+
+        Returns:
+            提取的关键信息字典（副本，调用方修改不影响缓存）
+        """
+        extracted = self._extract_cache.get(error_message)
+        if extracted is None:
+            if len(self._extract_cache) >= 128:
+                self._extract_cache.clear()
+            extracted = self.extract(error_message)
+            self._extract_cache[error_message] = extracted
+        return dict(extracted) if extracted else extracted
+
     @abstractmethod
     def fast_search(
         self,
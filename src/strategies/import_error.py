@@ -5,22 +5,26 @@ from .base import BaseErrorStrategy
 from src.models.results import SearchResult
 
 
-def _levenshtein_distance(s1: str, s2: str) -> int:
-    """计算两个字符串的编辑距离"""
-    if len(s1) < len(s2):
-        return _levenshtein_distance(s2, s1)
-    if len(s2) == 0:
-        return len(s1)
-    previous_row = range(len(s2) + 1)
-    for i, c1 in enumerate(s1):
-        current_row = [i + 1]
-        for j, c2 in enumerate(s2):
-            insertions = previous_row[j + 1] + 1
-            deletions = current_row[j] + 1
-            substitutions = previous_row[j] + (c1 != c2)
-            current_row.append(min(insertions, deletions, substitutions))
-        previous_row = current_row
-    return previous_row[-1]
+try:
+    # 优先使用 C 扩展实现，热路径上比纯 Python 双重循环快一个数量级
+    from Levenshtein import distance as _levenshtein_distance
+except ImportError:
+    def _levenshtein_distance(s1: str, s2: str) -> int:
+        """计算两个字符串的编辑距离"""
+        if len(s1) < len(s2):
+            return _levenshtein_distance(s2, s1)
+        if len(s2) == 0:
+            return len(s1)
+        previous_row = range(len(s2) + 1)
+        for i, c1 in enumerate(s1):
+            current_row = [i + 1]
+            for j, c2 in enumerate(s2):
+                insertions = previous_row[j + 1] + 1
+                deletions = current_row[j] + 1
+                substitutions = previous_row[j] + (c1 != c2)
+                current_row.append(min(insertions, deletions, substitutions))
+            previous_row = current_row
+        return previous_row[-1]
 
 
 class ImportErrorStrategy(BaseErrorStrategy):
@@ -53,7 +57,7 @@ class ImportErrorStrategy(BaseErrorStrategy):
         # 模块路径错误
         if "module" in extracted:
             module = extracted["module"]
-            matches = tools.search_module(module, fuzzy=True)
+            matches = tools.search_module(module, fuzzy=True, limit=1)
 
             # 额外：如果基础搜索置信度不高，尝试用 Levenshtein 提升拼写错误的置信度
             if matches and matches[0]['confidence'] < 0.8:
@@ -102,7 +106,7 @@ class ImportErrorStrategy(BaseErrorStrategy):
         # 符号导入错误
         if "symbol" in extracted:
             symbol = extracted["symbol"]
-            matches = tools.search_symbol(symbol, fuzzy=True, error_file=error_file)
+            matches = tools.search_symbol(symbol, fuzzy=True, error_file=error_file, limit=1)
             # 使用可配置的阈值（>=，而不是 >）
             if matches and matches[0].confidence >= self.confidence_threshold:
                 top_match = matches[0]
@@ -28,7 +28,7 @@ class NameErrorStrategy(BaseErrorStrategy):
         if not symbol:
             return None
 
-        matches = tools.search_symbol(symbol, fuzzy=True, error_file=error_file)
+        matches = tools.search_symbol(symbol, fuzzy=True, error_file=error_file, limit=1)
 
         # 如果找到高置信度匹配
         if matches and matches[0].confidence > self.confidence_threshold:
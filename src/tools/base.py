@@ -11,6 +11,16 @@ logger = logging.getLogger(__name__)
 class BaseTool(ABC):
     """工具基类"""
 
+    # JSON Schema 类型 -> Python 类型
+    _TYPE_MAPPING = {
+        "string": str,
+        "integer": int,
+        "number": (int, float),
+        "boolean": bool,
+        "array": list,
+        "object": dict
+    }
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -85,36 +95,46 @@ class BaseTool(ABC):
         Returns:
             错误消息（如果验证失败），None（如果验证通过）
         """
-        schema = self.get_parameters_schema()
-        required_params = schema.get("required", [])
+        required_params, required_set, param_types = self._get_param_spec()
 
-        # 检查必需参数
-        for param_name in required_params:
-            if param_name not in params:
-                return f"缺少必需参数: {param_name}"
+        # 检查必需参数（一次集合差运算，缺失时按 schema 顺序报告第一个）
+        missing = required_set.difference(params)
+        if missing:
+            param_name = next(p for p in required_params if p in missing)
+            return f"缺少必需参数: {param_name}"
 
         # 检查参数类型（基础检查）
-        properties = schema.get("properties", {})
         for param_name, param_value in params.items():
-            if param_name in properties:
-                expected_type = properties[param_name].get("type")
-                if expected_type and not self._check_type(param_value, expected_type):
-                    return f"参数 {param_name} 类型错误: 期望 {expected_type}, 得到 {type(param_value).__name__}"
+            expected = param_types.get(param_name)
+            if expected and not isinstance(param_value, expected[1]):
+                return f"参数 {param_name} 类型错误: 期望 {expected[0]}, 得到 {type(param_value).__name__}"
 
         return None
 
-    @staticmethod
-    def _check_type(value: Any, expected_type: str) -> bool:
+    def _get_param_spec(self) -> tuple:
+        """从参数 schema 预计算校验所需信息，每个工具实例只计算一次
+
+        Returns:
+            (必需参数元组, 必需参数 frozenset, {参数名: (schema 类型, Python 类型)})
+        """
+        spec = getattr(self, "_param_spec", None)
+        if spec is None:
+            schema = self.get_parameters_schema()
+            required_params = tuple(schema.get("required", []))
+            param_types = {}
+            for param_name, prop in schema.get("properties", {}).items():
+                expected_type = prop.get("type")
+                python_type = self._TYPE_MAPPING.get(expected_type)
+                if python_type is not None:  # 未知类型，跳过检查
+                    param_types[param_name] = (expected_type, python_type)
+            spec = (required_params, frozenset(required_params), param_types)
+            self._param_spec = spec
+        return spec
+
+    @classmethod
+    def _check_type(cls, value: Any, expected_type: str) -> bool:
         """检查值是否符合预期类型"""
-        type_mapping = {
-            "string": str,
-            "integer": int,
-            "number": (int, float),
-            "boolean": bool,
-            "array": list,
-            "object": dict
-        }
-        expected_python_type = type_mapping.get(expected_type)
+        expected_python_type = cls._TYPE_MAPPING.get(expected_type)
         if expected_python_type is None:
             return True  # 未知类型，跳过检查
         return isinstance(value, expected_python_type)
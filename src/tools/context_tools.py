@@ -1,10 +1,14 @@
 """ContextTools - 预建索引层，支持增量更新和缓存"""
 import pickle
 import hashlib
+import heapq
 import ast
 import logging
+import os
+from collections import OrderedDict
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, Optional, Set, Tuple
 from dataclasses import dataclass
 
 try:
@@ -32,6 +36,17 @@ from src.models.results import SymbolMatch
 logger = logging.getLogger(__name__)
 
 
+def _length_prefilter(len_a: int, len_b: int, threshold: float) -> bool:
+    """长度粗筛：编辑距离不小于长度差，据此给出相似度上界
+
+    上界都不超过阈值的候选无需计算 Levenshtein，直接跳过
+    """
+    max_len = max(len_a, len_b)
+    if max_len == 0:
+        return False
+    return 1 - abs(len_a - len_b) / max_len > threshold
+
+
 class ContextTools:
     """预建索引层 - 支持增量更新和缓存"""
 
@@ -60,6 +75,17 @@ class ContextTools:
 
         # 文件哈希记录（用于增量更新）
         self.file_hashes: Dict[str, str] = {}
+        # 最近一次遍历得到的项目哈希，保存缓存时复用
+        self._project_hash: Optional[str] = None
+        # 符号名按长度分桶（模糊搜索用，附带预先转好的小写形式），
+        # 符号表增删名称时置空，下次搜索时重建
+        self._symbols_by_length: Optional[Dict[int, List[Tuple[int, str, str]]]] = None
+        # search_symbol 结果缓存（同一轮调试中策略、调查和范围分析会重复搜索同一符号），
+        # 按最近使用顺序淘汰，符号表有任何变化时清空
+        self._symbol_search_cache: "OrderedDict[tuple, List[SymbolMatch]]" = OrderedDict()
+        # 模块搜索用的 .py 文件清单，及列出清单时各目录的 mtime（增删文件会改变所在目录的 mtime）
+        self._module_files: Optional[List[str]] = None
+        self._dir_mtimes: Dict[str, int] = {}
 
         logger.info(f"初始化 ContextTools，项目路径: {self.project_path}")
         self._load_or_build_indexes()
@@ -83,7 +109,8 @@ class ContextTools:
                 if not isinstance(cached, dict):
                     raise ValueError(f"缓存数据格式错误，期望 dict，得到 {type(cached).__name__}")
 
-                current_hash = self._get_project_hash()
+                # 一次遍历同时拿到项目哈希和文件哈希，增量更新与保存缓存都复用
+                current_hash, current_file_hashes = self._scan_project()
 
                 if cached.get('project_hash') == current_hash:
                     logger.info("从缓存加载索引")
@@ -91,7 +118,7 @@ class ContextTools:
                     return
                 else:
                     logger.info("项目已更新，执行增量更新")
-                    self._incremental_update(cached)
+                    self._incremental_update(cached, current_file_hashes)
                     return
             except (pickle.UnpicklingError, EOFError) as e:
                 logger.warning(f"缓存文件损坏: {e}，删除并重新构建索引")
@@ -110,31 +137,35 @@ class ContextTools:
             logger.error(f"索引构建失败: {e}", exc_info=True)
             raise RuntimeError(f"无法构建项目索引: {e}") from e
 
-    def _get_project_hash(self) -> str:
-        """计算项目哈希值（用于快速变更检测）"""
+    def _scan_project(self) -> Tuple[str, Dict[str, str]]:
+        """遍历一次项目，同时得到项目哈希和文件哈希
+
+        Returns:
+            (项目哈希, {相对路径: 文件哈希})
+        """
         mtimes = []
+        hashes = {}
         for py_file in self.project_path.rglob("*.py"):
             if self._should_ignore(py_file):
                 continue
             try:
-                mtimes.append(f"{py_file}:{py_file.stat().st_mtime}")
+                mtime = py_file.stat().st_mtime
+                relative_path = str(py_file.relative_to(self.project_path))
             except:
                 continue
-        return hashlib.md5("\n".join(sorted(mtimes)).encode()).hexdigest()
+            mtimes.append(f"{py_file}:{mtime}")
+            hashes[relative_path] = hashlib.md5(f"{mtime}".encode()).hexdigest()
+
+        self._project_hash = hashlib.md5("\n".join(sorted(mtimes)).encode()).hexdigest()
+        return self._project_hash, hashes
+
+    def _get_project_hash(self) -> str:
+        """计算项目哈希值（用于快速变更检测）"""
+        return self._scan_project()[0]
 
     def _get_file_hashes(self) -> Dict[str, str]:
         """获取所有文件的哈希值字典（用于增量更新）"""
-        hashes = {}
-        for py_file in self.project_path.rglob("*.py"):
-            if self._should_ignore(py_file):
-                continue
-            try:
-                relative_path = str(py_file.relative_to(self.project_path))
-                mtime = py_file.stat().st_mtime
-                hashes[relative_path] = hashlib.md5(f"{mtime}".encode()).hexdigest()
-            except:
-                continue
-        return hashes
+        return self._scan_project()[1]
 
     def _should_ignore(self, path: Path) -> bool:
         """判断是否应该忽略路径"""
@@ -144,20 +175,19 @@ class ContextTools:
     def _full_build(self):
         """完整构建索引"""
         logger.info("开始完整索引构建")
-        for py_file in self.project_path.rglob("*.py"):
-            if self._should_ignore(py_file):
-                continue
-            self._index_single_file(py_file)
+        # 遍历一次得到文件清单和哈希，索引直接基于该清单
+        _, self.file_hashes = self._scan_project()
+        for relative_path in self.file_hashes:
+            self._index_single_file(self.project_path / relative_path)
 
-        # 更新文件哈希
-        self.file_hashes = self._get_file_hashes()
         logger.info(f"索引构建完成，符号数: {sum(len(v) for v in self.symbol_table.values())}")
 
-    def _incremental_update(self, cached: dict):
+    def _incremental_update(self, cached: dict, new_hashes: Optional[Dict[str, str]] = None):
         """增量更新索引 - 只重建有变更的文件
 
         Args:
             cached: 缓存的索引数据
+            new_hashes: 当前文件哈希（调用方已遍历过时传入，避免重复遍历）
 
         Note:
             更新失败时会回退到完整重建
@@ -166,7 +196,8 @@ class ContextTools:
             self._load_from_cache(cached)
 
             old_hashes = self.file_hashes
-            new_hashes = self._get_file_hashes()
+            if new_hashes is None:
+                new_hashes = self._get_file_hashes()
 
             # 找出变更的文件
             changed_files = []
@@ -188,19 +219,15 @@ class ContextTools:
 
             logger.info(f"增量更新: {len(changed_files)} 个文件变更, {len(deleted_files)} 个文件删除")
 
-            # 清理删除文件的索引
-            for file_path in deleted_files:
-                try:
-                    self._remove_file_symbols(file_path)
-                except Exception as e:
-                    logger.warning(f"清理文件索引失败 {file_path}: {e}")
+            # 删除和变更文件的旧索引一次性批量清理
+            try:
+                self._remove_files_symbols(set(deleted_files) | set(changed_files))
+            except Exception as e:
+                logger.warning(f"清理文件索引失败: {e}")
 
             # 重建变更文件的索引
             for file_path in changed_files:
                 try:
-                    # 先清理旧索引
-                    self._remove_file_symbols(file_path)
-                    # 重新索引
                     full_path = self.project_path / file_path
                     if full_path.exists():
                         self._index_single_file(full_path)
@@ -221,34 +248,44 @@ class ContextTools:
 
     def _remove_file_symbols(self, relative_path: str):
         """清理指定文件的所有索引数据"""
+        self._remove_files_symbols({relative_path})
+
+    def _remove_files_symbols(self, relative_paths: Set[str]):
+        """批量清理多个文件的索引数据
+
+        每张索引表只遍历一次，避免增量更新时每个文件都全表扫描
+        """
+        if not relative_paths:
+            return
+
         # 清理 symbol_table
         for symbol_name in list(self.symbol_table.keys()):
-            self.symbol_table[symbol_name] = [
-                match for match in self.symbol_table[symbol_name]
-                if match.file != relative_path
-            ]
-            if not self.symbol_table[symbol_name]:
+            matches = self.symbol_table[symbol_name]
+            kept = [match for match in matches if match.file not in relative_paths]
+            if not kept:
                 del self.symbol_table[symbol_name]
-
-        # 清理 import_graph
-        if relative_path in self.import_graph:
-            del self.import_graph[relative_path]
+                self._symbols_by_length = None
+            elif len(kept) != len(matches):
+                self.symbol_table[symbol_name] = kept
+        self._symbol_search_cache.clear()
 
         # 清理 class_table
         for class_name in list(self.class_table.keys()):
-            if self.class_table[class_name].get('file') == relative_path:
+            if self.class_table[class_name].get('file') in relative_paths:
                 del self.class_table[class_name]
 
         # 清理 function_signatures
+        prefixes = tuple(f"{path}:" for path in relative_paths)
         for sig_key in list(self.function_signatures.keys()):
-            if sig_key.startswith(f"{relative_path}:"):
+            if sig_key.startswith(prefixes):
                 del self.function_signatures[sig_key]
 
-        # 清理 call_graph
-        if relative_path in self.call_graph:
-            del self.call_graph[relative_path]
+        # 清理 import_graph / call_graph
+        for relative_path in relative_paths:
+            self.import_graph.pop(relative_path, None)
+            self.call_graph.pop(relative_path, None)
 
-        logger.debug(f"已清理文件索引: {relative_path}")
+        logger.debug(f"已清理 {len(relative_paths)} 个文件的索引")
 
     def _index_single_file(self, file_path: Path):
         """索引单个文件
@@ -267,12 +304,12 @@ class ContextTools:
                 # 尝试其他编码
                 try:
                     content = file_path.read_text(encoding='latin-1')
-                    logger.debug(f"使用 latin-1 编码读取文件: {file_path}")
+                    logger.debug("使用 latin-1 编码读取文件: %s", file_path)
                 except Exception as e:
                     logger.warning(f"无法读取文件 {file_path}: {e}")
                     return
             except FileNotFoundError:
-                logger.debug(f"文件不存在（可能已被删除）: {file_path}")
+                logger.debug("文件不存在（可能已被删除）: %s", file_path)
                 return
             except PermissionError:
                 logger.warning(f"无权限读取文件: {file_path}")
@@ -282,10 +319,10 @@ class ContextTools:
             try:
                 tree = ast.parse(content, filename=str(file_path))
             except SyntaxError as e:
-                logger.debug(f"跳过语法错误文件: {file_path}:{e.lineno} - {e.msg}")
+                logger.debug("跳过语法错误文件: %s:%s - %s", file_path, e.lineno, e.msg)
                 return
             except ValueError as e:
-                logger.debug(f"AST 解析失败（可能包含空字节）: {file_path} - {e}")
+                logger.debug("AST 解析失败（可能包含空字节）: %s - %s", file_path, e)
                 return
 
             relative_path = str(file_path.relative_to(self.project_path))
@@ -317,7 +354,7 @@ class ContextTools:
                                 if isinstance(key, ast.Constant) and isinstance(key.value, str):
                                     self.dict_keys.add(key.value)
                     except Exception as e:
-                        logger.debug(f"处理节点失败 {type(node).__name__} in {file_path}: {e}")
+                        logger.debug("处理节点失败 %s in %s: %s", type(node).__name__, file_path, e)
                         continue
 
             except Exception as e:
@@ -364,6 +401,9 @@ class ContextTools:
         """添加符号到索引"""
         if name not in self.symbol_table:
             self.symbol_table[name] = []
+            self._symbols_by_length = None
+        if self._symbol_search_cache:
+            self._symbol_search_cache.clear()
         self.symbol_table[name].append(SymbolMatch(
             name=name,
             file=file,
@@ -427,16 +467,43 @@ class ContextTools:
         self,
         name: str,
         fuzzy: bool = True,
-        error_file: str = ""
+        error_file: str = "",
+        limit: Optional[int] = None
     ) -> List[SymbolMatch]:
-        """搜索符号，支持模糊匹配"""
-        # 精确匹配
+        """搜索符号，支持模糊匹配
+
+        limit: 只需要前 N 个结果时传入，用部分排序代替全量排序
+        """
+        cache_key = (name, fuzzy, error_file, limit)
+        cache = self._symbol_search_cache
+        cached = cache.get(cache_key)
+        if cached is not None:
+            cache.move_to_end(cache_key)
+            return cached.copy()
+
+        matches = self._search_symbol(name, fuzzy, error_file, limit)
+
+        # LRU 淘汰：只丢弃最久未使用的一条，反复查询的热点符号保留在缓存中
+        if len(cache) >= 256:
+            cache.popitem(last=False)
+        cache[cache_key] = matches
+        return matches.copy()
+
+    def _search_symbol(
+        self,
+        name: str,
+        fuzzy: bool,
+        error_file: str,
+        limit: Optional[int]
+    ) -> List[SymbolMatch]:
+        """search_symbol 的实际搜索逻辑（不经过缓存）"""
+        # 精确匹配（置信度均为 1.0，无需排序）
         if name in self.symbol_table:
             matches = self.symbol_table[name].copy()
             for m in matches:
                 m.confidence = 1.0
             logger.info(f"精确匹配到符号 '{name}': {len(matches)} 个位置")
-            return sorted(matches, key=lambda x: x.confidence, reverse=True)
+            return matches if limit is None else matches[:limit]
 
         if not fuzzy:
             return []
@@ -444,13 +511,32 @@ class ContextTools:
         # 模糊匹配
         logger.info(f"开始模糊匹配符号 '{name}'")
         matches = []
-        for symbol_name, locations in self.symbol_table.items():
-            dist = levenshtein(name.lower(), symbol_name.lower())
+        query = name.lower()
+
+        # 粗筛：长度差已决定相似度上界，只取长度可能过阈值的桶；
+        # 各桶内按符号表顺序存放，merge 后遍历顺序与直接遍历符号表一致
+        buckets = self._get_symbols_by_length()
+        candidates = heapq.merge(*(
+            bucket for length, bucket in buckets.items()
+            if _length_prefilter(len(name), length, 0.6)
+        ))
+        for _, symbol_name, symbol_lower in candidates:
+            locations = self.symbol_table[symbol_name]
+
+            # 精排：只对通过粗筛的候选计算编辑距离
+            dist = levenshtein(query, symbol_lower)
             max_len = max(len(name), len(symbol_name))
             similarity = 1 - (dist / max_len)
 
             # 降低阈值到 0.6，允许编辑距离 ≤ 2 的拼写错误通过
             if similarity > 0.6:  # 阈值
+                # 置信度使用区分大小写的编辑距离；两者都是小写时与上面相同，直接复用。
+                # 同一符号的多个位置共用这一结果
+                if query == name and symbol_lower == symbol_name:
+                    edit_dist = dist
+                else:
+                    edit_dist = levenshtein(name, symbol_name)
+
                 for loc in locations:
                     match = SymbolMatch(
                         name=symbol_name,
@@ -458,28 +544,48 @@ class ContextTools:
                         line=loc.line,
                         symbol_type=loc.symbol_type,
                         confidence=self._calculate_confidence(
-                            name, symbol_name, loc, error_file
+                            name, symbol_name, loc, error_file, edit_dist
                         )
                     )
                     matches.append(match)
 
-        matches = sorted(matches, key=lambda x: x.confidence, reverse=True)
         logger.info(f"模糊匹配到 {len(matches)} 个候选")
-        return matches
+        if limit is not None:
+            return heapq.nlargest(limit, matches, key=attrgetter('confidence'))
+        return sorted(matches, key=attrgetter('confidence'), reverse=True)
+
+    def _get_symbols_by_length(self) -> Dict[int, List[Tuple[int, str, str]]]:
+        """按长度分桶的符号名 {长度: [(符号表中的位置, 符号名, 小写符号名), ...]}
+
+        小写形式在建桶时算好，模糊搜索时不必每次对每个候选调用 lower()
+        """
+        if self._symbols_by_length is None:
+            buckets: Dict[int, List[Tuple[int, str, str]]] = {}
+            for position, symbol_name in enumerate(self.symbol_table):
+                buckets.setdefault(len(symbol_name), []).append(
+                    (position, symbol_name, symbol_name.lower())
+                )
+            self._symbols_by_length = buckets
+        return self._symbols_by_length
 
     def _calculate_confidence(
         self,
         query: str,
         match: str,
         loc: SymbolMatch,
-        error_file: str
+        error_file: str,
+        edit_dist: Optional[int] = None
     ) -> float:
-        """多因子加权置信度"""
+        """多因子加权置信度
+
+        edit_dist: 调用方已算好的 query 与 match 的编辑距离，None 时在此计算
+        """
         score = 0.0
 
         # 1. 编辑距离 (0.5) - 提高权重，因为这是最重要的指标
         max_len = max(len(query), len(match))
-        edit_dist = levenshtein(query, match)
+        if edit_dist is None:
+            edit_dist = levenshtein(query, match)
         edit_sim = 1 - (edit_dist / max_len)
 
         # 对于非常接近的匹配（编辑距离 ≤ 2），给予额外奖励
@@ -511,18 +617,26 @@ class ContextTools:
         # 简化实现：同一项目内都认为可导入
         return True
 
-    def search_module(self, module: str, fuzzy: bool = True) -> List[dict]:
-        """搜索模块路径 - 增强版，支持路径结构匹配和包搜索"""
+    def search_module(
+        self,
+        module: str,
+        fuzzy: bool = True,
+        limit: Optional[int] = None
+    ) -> List[dict]:
+        """搜索模块路径 - 增强版，支持路径结构匹配和包搜索
+
+        limit: 只需要前 N 个结果时传入，用部分排序代替全量排序
+        """
         results = []
         module_parts = module.split('.')  # ['api', 'endpoints', 'users'] 或 ['api', 'endpoints']
         target_name = module_parts[-1]    # 'users' 或 'endpoints'
 
-        # 1. 搜索 .py 文件
-        for py_file in self.project_path.rglob("*.py"):
-            if self._should_ignore(py_file):
-                continue
+        # 复用索引阶段记录的文件清单，不再每次查询都遍历磁盘
+        indexed_files = self._indexed_files()
 
-            rel_path = py_file.relative_to(self.project_path)
+        # 1. 搜索 .py 文件
+        for rel_file in indexed_files:
+            rel_path = Path(rel_file)
             # 转换为模块路径: api/v2/endpoints/users.py -> api.v2.endpoints.users
             actual_module_path = str(rel_path.with_suffix('')).replace('/', '.')
             actual_parts = actual_module_path.split('.')
@@ -530,18 +644,17 @@ class ContextTools:
             # 检查文件匹配
             self._check_module_match(
                 module_parts, target_name, actual_module_path, actual_parts,
-                str(rel_path), fuzzy, results
+                rel_file, fuzzy, results
             )
 
         # 2. 搜索包（带 __init__.py 的目录）- 对于缺少中间包层级的情况很重要
-        for init_file in self.project_path.rglob("__init__.py"):
-            if self._should_ignore(init_file):
+        for rel_file in indexed_files:
+            rel_path = Path(rel_file)
+            if rel_path.name != "__init__.py":
                 continue
 
-            # 包路径是 __init__.py 的父目录
-            pkg_dir = init_file.parent
-            rel_path = pkg_dir.relative_to(self.project_path)
-            # 转换为模块路径: api/v2/endpoints -> api.v2.endpoints
+            # 包路径是 __init__.py 的父目录: api/v2/endpoints -> api.v2.endpoints
+            rel_path = rel_path.parent
             actual_module_path = str(rel_path).replace('/', '.')
             if actual_module_path == '.':
                 continue  # 跳过根目录
@@ -553,16 +666,62 @@ class ContextTools:
                 str(rel_path), fuzzy, results, is_package=True
             )
 
-        # 去重并排序
-        seen = set()
-        unique_results = []
-        for r in sorted(results, key=lambda x: x['confidence'], reverse=True):
-            key = r['module']
-            if key not in seen:
-                seen.add(key)
-                unique_results.append(r)
-
-        return unique_results
+        # 去重并排序：一次遍历保留每个模块置信度最高的结果，只对去重后的结果排序
+        best = {}
+        for i, r in enumerate(results):
+            current = best.get(r['module'])
+            if current is None or r['confidence'] > current[1]['confidence']:
+                best[r['module']] = (i, r)
+
+        rank_key = lambda x: (-x[1]['confidence'], x[0])
+        if limit is not None:
+            ranked = heapq.nsmallest(limit, best.values(), key=rank_key)
+        else:
+            ranked = sorted(best.values(), key=rank_key)
+        return [r for _, r in ranked]
+
+    def _indexed_files(self) -> List[str]:
+        """返回项目中 .py 文件的相对路径（按路径排序）
+
+        首次调用时遍历一次项目；之后只检查各目录的 mtime，
+        有文件新增或删除（目录 mtime 变化）时才重新遍历
+        """
+        if self._module_files is None or self._dirs_changed():
+            self._module_files, self._dir_mtimes = self._list_python_files()
+        return self._module_files
+
+    def _list_python_files(self) -> Tuple[List[str], Dict[str, int]]:
+        """遍历项目，返回 (.py 文件相对路径列表, {目录: mtime_ns})"""
+        files = []
+        dir_mtimes = {}
+        for root, dirs, names in os.walk(self.project_path):
+            # 忽略规则以 "/venv/" 形式书写，目录路径补上末尾分隔符再匹配
+            if self._should_ignore(f"{root}/"):
+                dirs[:] = []
+                continue
+            try:
+                dir_mtimes[root] = os.stat(root).st_mtime_ns
+            except OSError:
+                continue
+            root_path = Path(root)
+            for name in names:
+                if not name.endswith('.py'):
+                    continue
+                py_file = root_path / name
+                if not self._should_ignore(py_file):
+                    files.append(str(py_file.relative_to(self.project_path)))
+        files.sort()
+        return files, dir_mtimes
+
+    def _dirs_changed(self) -> bool:
+        """自上次列出文件清单后，是否有目录被修改或删除"""
+        for directory, mtime in self._dir_mtimes.items():
+            try:
+                if os.stat(directory).st_mtime_ns != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
 
     def _check_module_match(
         self, query_parts: List[str], target_name: str,
@@ -724,6 +883,8 @@ class ContextTools:
         # 模糊匹配
         matches = []
         for key in self.dict_keys:
+            if not _length_prefilter(len(query), len(key), 0.7):
+                continue
             dist = levenshtein(query, key)
             max_len = max(len(query), len(key))
             similarity = 1 - (dist / max_len)
@@ -738,6 +899,7 @@ class ContextTools:
         用于处理如 config["log_level"] → config["logging"]["level"] 的情况
         """
         results = []
+        missing_key_lower = missing_key.lower()
 
         for func_key, info in self.function_return_keys.items():
             structure = info.get('structure', {})
@@ -764,7 +926,7 @@ class ContextTools:
 
             # 3. 模糊匹配顶层键
             for key in structure.get('keys', []):
-                dist = levenshtein(missing_key.lower(), key.lower())
+                dist = levenshtein(missing_key_lower, key.lower())
                 if dist <= 2 and dist > 0:  # 编辑距离 ≤ 2 且不完全相同
                     similarity = 1 - (dist / max(len(missing_key), len(key)))
                     results.append({
@@ -778,7 +940,7 @@ class ContextTools:
                     })
 
         # 按置信度排序
-        return sorted(results, key=lambda x: x['confidence'], reverse=True)
+        return sorted(results, key=itemgetter('confidence'), reverse=True)
 
     def _search_nested_key(
         self, structure: Dict, missing_key: str,
@@ -837,6 +999,17 @@ class ContextTools:
         cycles = []
         visited = set()
         rec_stack = set()
+        files = list(self.import_graph.keys())
+        # 导入名 → 对应文件列表，同一导入名只匹配一次全部文件
+        neighbor_files: Dict[str, List[str]] = {}
+
+        def resolve(neighbor: str) -> List[str]:
+            matched = neighbor_files.get(neighbor)
+            if matched is None:
+                suffix = f"{neighbor}.py"
+                matched = [f for f in files if neighbor in f or f.endswith(suffix)]
+                neighbor_files[neighbor] = matched
+            return matched
 
         def dfs(node: str, path: List[str]):
             if node in rec_stack:
@@ -855,13 +1028,12 @@ class ContextTools:
 
             for neighbor in self.import_graph.get(node, []):
                 # 查找对应的文件
-                for file in self.import_graph.keys():
-                    if neighbor in file or file.endswith(f"{neighbor}.py"):
-                        dfs(file, path.copy())
+                for file in resolve(neighbor):
+                    dfs(file, path.copy())
 
             rec_stack.remove(node)
 
-        for file in self.import_graph.keys():
+        for file in files:
             if file not in visited:
                 dfs(file, [])
 
@@ -880,7 +1052,7 @@ class ContextTools:
 
         try:
             data = {
-                'project_hash': self._get_project_hash(),
+                'project_hash': self._project_hash or self._get_project_hash(),
                 'file_hashes': self.file_hashes,
                 'symbol_table': self.symbol_table,
                 'import_graph': self.import_graph,
@@ -925,6 +1097,8 @@ class ContextTools:
         try:
             self.file_hashes = cached.get('file_hashes', {})
             self.symbol_table = cached.get('symbol_table', {})
+            self._symbols_by_length = None
+            self._symbol_search_cache.clear()
             self.import_graph = cached.get('import_graph', {})
             self.class_table = cached.get('class_table', {})
             self.function_signatures = cached.get('function_signatures', {})
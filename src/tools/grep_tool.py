@@ -1,6 +1,6 @@
 """代码搜索工具（grep）"""
 import re
-import subprocess
+import asyncio
 from pathlib import Path
 from typing import List
 import logging
@@ -8,6 +8,12 @@ from .base import BaseTool
 
 logger = logging.getLogger(__name__)
 
+# 两种实现共用的结果数量上限
+MAX_RESULTS = 50
+
+# 超长行（压缩代码、数据文件）只保留前 N 列预览，避免把整行传回
+_RG_MAX_COLUMNS = 500
+
 
 class GrepTool(BaseTool):
     """在代码库中搜索关键词或正则表达式"""
@@ -61,70 +67,88 @@ class GrepTool(BaseTool):
         # 尝试使用系统的 ripgrep (rg)
         try:
             # 优先使用 ripgrep
-            cmd = ["rg", "--json", "-n", pattern, str(search_path)]
+            # 用纯文本输出（文件名后接 NUL）代替 --json：只需要文件、行号和行内容，
+            # --json 额外输出的 begin/end/summary 记录和 submatches 都用不到
+            cmd = [
+                "rg", "--null", "--line-number", "--no-heading", "--with-filename",
+                "--color", "never",
+                "--max-columns", str(_RG_MAX_COLUMNS), "--max-columns-preview",
+                pattern, str(search_path)
+            ]
             if not use_regex:
                 cmd.insert(1, "-F")  # 固定字符串模式
 
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=10
+            # 异步子进程，等待 rg 时不阻塞事件循环（同一轮的其他工具可并发执行）
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL
             )
-
-            if result.returncode == 0:
+            try:
+                stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=10)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                logger.warning(f"ripgrep 搜索超时: {pattern}")
+                raise TimeoutError(f"搜索超时 (>10s): {pattern}")
+
+            if proc.returncode == 0:
                 logger.debug(f"ripgrep 搜索成功: {pattern}")
-                return self._parse_rg_output(result.stdout)
-            elif result.returncode == 1:
+                return self._parse_rg_output(stdout.decode('utf-8', errors='replace'))
+            elif proc.returncode == 1:
                 # ripgrep 返回 1 表示没有匹配
                 logger.debug(f"ripgrep 未找到匹配: {pattern}")
                 return []
 
         except FileNotFoundError:
             logger.debug("ripgrep 未安装，使用 Python 实现")
-        except subprocess.TimeoutExpired:
-            logger.warning(f"ripgrep 搜索超时: {pattern}")
-            raise TimeoutError(f"搜索超时 (>10s): {pattern}")
+        except TimeoutError:
+            raise
         except Exception as e:
             logger.warning(f"ripgrep 执行失败: {e}，使用 Python 实现")
 
-        # 回退到 Python 实现
-        return self._python_grep(pattern, search_path, use_regex)
+        # 回退到 Python 实现（在线程中执行，同样不阻塞事件循环）
+        return await asyncio.to_thread(self._python_grep, pattern, search_path, use_regex)
 
     def _parse_rg_output(self, output: str) -> List[dict]:
-        """解析 ripgrep JSON 输出
+        """解析 ripgrep 输出
+
+        每行格式为 "文件路径\0行号:行内容"，文件路径后的 NUL 分隔符
+        保证路径中含冒号时也能正确切分
 
         Args:
-            output: ripgrep 的 JSON 输出
+            output: ripgrep 的输出
 
         Returns:
-            解析后的匹配结果列表
+            解析后的匹配结果列表（最多 MAX_RESULTS 条）
         """
-        import json
         results = []
 
         if not output or not output.strip():
             return results
 
-        for line in output.strip().split('\n'):
+        # 只按 \n 切分：splitlines 还会在 \x0c、\x1c-\x1e、\x85、\u2028 等字符处断行，
+        # 而 ripgrep 输出的一行内容中可能包含这些字符
+        for line in output.split('\n'):
             if not line:
                 continue
-            try:
-                data = json.loads(line)
-                if data.get('type') == 'match':
-                    match_data = data['data']
-                    results.append({
-                        'file': match_data['path']['text'],
-                        'line': match_data['line_number'],
-                        'content': match_data['lines']['text'].strip()
-                    })
-            except (json.JSONDecodeError, KeyError) as e:
-                logger.debug(f"解析 ripgrep 输出行失败: {e}")
-                continue
-            except Exception as e:
-                logger.warning(f"处理 ripgrep 输出时出错: {e}")
+            line = line.removesuffix('\r')
+            file_path, sep, rest = line.partition('\0')
+            line_num, colon, content = rest.partition(':')
+            if not sep or not colon or not line_num.isdigit():
+                logger.debug("跳过无法解析的 ripgrep 输出行: %.100s", line)
                 continue
 
+            results.append({
+                'file': file_path,
+                'line': int(line_num),
+                'content': content.strip()
+            })
+
+            if len(results) >= MAX_RESULTS:
+                logger.debug(f"达到结果上限 ({MAX_RESULTS})，忽略其余匹配")
+                break
+
         return results
 
     def _python_grep(self, pattern: str, search_path: Path, use_regex: bool) -> List[dict]:
@@ -166,6 +190,11 @@ class GrepTool(BaseTool):
 
                 try:
                     content = py_file.read_text(encoding='utf-8')
+
+                    # 字面量搜索先对整个文件做一次子串查找，不包含的文件无需逐行切分扫描
+                    if regex_pattern is None and pattern not in content:
+                        continue
+
                     for line_num, line in enumerate(content.split('\n'), 1):
                         match = False
                         if use_regex and regex_pattern:
@@ -181,15 +210,15 @@ class GrepTool(BaseTool):
                             })
 
                             # 限制结果数量
-                            if len(results) >= 50:
-                                logger.debug(f"达到结果上限 (50)，停止搜索")
+                            if len(results) >= MAX_RESULTS:
+                                logger.debug(f"达到结果上限 ({MAX_RESULTS})，停止搜索")
                                 return results
 
                 except UnicodeDecodeError:
-                    logger.debug(f"跳过非 UTF-8 文件: {py_file}")
+                    logger.debug("跳过非 UTF-8 文件: %s", py_file)
                     continue
                 except Exception as e:
-                    logger.debug(f"读取文件失败 {py_file}: {e}")
+                    logger.debug("读取文件失败 %s: %s", py_file, e)
                     continue
 
         except Exception as e:
@@ -1,4 +1,5 @@
 """文件读取工具"""
+from itertools import islice
 from pathlib import Path
 import logging
 from .base import BaseTool
@@ -7,6 +8,15 @@ from src.models.tool_result import ToolResult, ErrorType
 logger = logging.getLogger(__name__)
 
 
+def _split_lines(f):
+    """逐行读取文件，结果与读取全文后按换行符切分一致（以换行结尾时最后多一个空行）"""
+    line = ''
+    for line in f:
+        yield line[:-1] if line.endswith('\n') else line
+    if not line or line.endswith('\n'):
+        yield ''
+
+
 class ReadFileTool(BaseTool):
     """读取文件内容，可指定行范围"""
 
@@ -70,9 +80,14 @@ class ReadFileTool(BaseTool):
         if not file_path.is_file():
             raise ValueError(f"路径不是文件: {path}")
 
-        # 读取文件
+        # 逐行读取文件：跳过起始行之前的内容，读到结束行即停止，不把整个文件载入内存
+        start_idx = start_line - 1
         try:
-            content = file_path.read_text(encoding='utf-8')
+            with open(file_path, encoding='utf-8') as f:
+                lines = _split_lines(f)
+                skipped = sum(1 for _ in islice(lines, start_idx))
+                count = None if end_line is None else end_line - start_idx
+                selected_lines = list(islice(lines, count))
         except UnicodeDecodeError as e:
             logger.error(f"文件编码错误: {file_path}")
             raise UnicodeDecodeError(
@@ -80,18 +95,13 @@ class ReadFileTool(BaseTool):
                 f"无法以 UTF-8 编码读取文件: {path}"
             )
 
-        lines = content.split('\n')
-        total_lines = len(lines)
-
-        # 调整行号（从1开始）
-        start_idx = max(0, start_line - 1)
-        end_idx = total_lines if end_line is None else min(total_lines, end_line)
-
-        if start_idx >= total_lines:
+        if not selected_lines:
+            # 起始行之前的内容已经读完，跳过的行数即文件总行数
+            total_lines = skipped
             logger.warning(f"起始行号 {start_line} 超出文件范围 (共 {total_lines} 行)")
             return f"文件共 {total_lines} 行，起始行号 {start_line} 超出范围"
 
-        selected_lines = lines[start_idx:end_idx]
+        end_idx = start_idx + len(selected_lines)
 
         # 返回带行号的内容
         result_lines = []
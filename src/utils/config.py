@@ -44,6 +44,9 @@ class Settings(BaseSettings):
     max_retry_attempts: int = 3
     sandbox_timeput: int = 10
 
+    # LLM 原始响应缓存（SQLite 文件路径），为空表示不启用；反复跑 benchmark 时可开启
+    llm_response_cache_path: str = ""
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -1,5 +1,6 @@
 """对话压缩器 - 管理长对话上下文"""
 import logging
+from functools import lru_cache
 from typing import List, Dict
 
 try:
@@ -12,6 +13,19 @@ from src.models.scratchpad import Scratchpad
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _get_encoder(model: str):
+    """按模型名加载 token 编码器（进程内只加载一次），tiktoken 未安装时返回 None"""
+    if tiktoken is None:
+        logger.warning("tiktoken 未安装，使用近似 token 计数")
+        return None
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except Exception:
+        return tiktoken.get_encoding("cl100k_base")
+
+
 class ConversationCompressor:
     """对话压缩器 - 滑动窗口 + LLM 总结"""
 
@@ -31,26 +45,38 @@ class ConversationCompressor:
         """
         self.max_tokens = max_tokens
         self.preserve_ratio = preserve_ratio
+        self.model = model
+        # 消息内容 → token 数，压缩前后大部分消息不变，无需重复编码
+        self._token_counts: Dict[str, int] = {}
 
-        # 初始化 token 编码器
-        if tiktoken:
-            try:
-                self.encoder = tiktoken.encoding_for_model(model)
-            except:
-                self.encoder = tiktoken.get_encoding("cl100k_base")
-        else:
-            self.encoder = None
-            logger.warning("tiktoken 未安装，使用近似 token 计数")
+    @property
+    def encoder(self):
+        """token 编码器，首次计数时才加载，所有实例共用"""
+        return _get_encoder(self.model)
 
     def _count_tokens(self, messages: List[Dict]) -> int:
         """计算消息列表的 token 数"""
-        if self.encoder:
-            total = 0
-            for msg in messages:
-                content = msg.get("content", "")
-                if isinstance(content, str):
-                    total += len(self.encoder.encode(content))
-            return total
+        encoder = self.encoder
+        if encoder:
+            texts = [
+                content for content in (msg.get("content", "") for msg in messages)
+                if isinstance(content, str)
+            ]
+            token_counts = self._token_counts
+
+            # 只编码未缓存过的内容
+            pending = [text for text in dict.fromkeys(texts) if text not in token_counts]
+            if pending:
+                if len(token_counts) + len(pending) > 4096:
+                    token_counts.clear()
+                # batch 接口每次调用都会新建线程池，只在冷启动、待编码内容较多时使用
+                if len(pending) < 8:
+                    encoded = map(encoder.encode_ordinary, pending)
+                else:
+                    encoded = encoder.encode_ordinary_batch(pending)
+                token_counts.update(zip(pending, map(len, encoded)))
+
+            return sum(token_counts[text] for text in texts)
         else:
             # 简单近似：每个字符约 0.3 个 token
             total_chars = sum(len(msg.get("content", "")) for msg in messages)
@@ -0,0 +1,47 @@
+"""JSON 读写辅助 - 安装了 orjson 时优先使用 orjson"""
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps_bytes(data: Any, indent: bool = True, default: Optional[Callable] = None) -> bytes:
+    """序列化为 UTF-8 JSON 字节串（中文不转义）
+
+    Args:
+        data: 要序列化的对象
+        indent: 是否使用 2 空格缩进
+        default: 无法直接序列化的对象的转换函数（如 str）
+    """
+    if orjson is not None:
+        # OPT_NON_STR_KEYS：与标准库一致，int 等非字符串键转为字符串
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=default, option=option)
+    return json.dumps(
+        data, ensure_ascii=False, indent=2 if indent else None, default=default
+    ).encode('utf-8')
+
+
+def loads(raw: bytes) -> Any:
+    """解析 JSON 字节串或字符串"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def write_json_atomic(path: Path, data: Any, indent: bool = True):
+    """完整序列化后一次写入临时文件，再原子替换目标文件
+
+    写入中途出错或进程退出时，原文件保持完整
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(dumps_bytes(data, indent=indent))
+    os.replace(tmp_path, path)
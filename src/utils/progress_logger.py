@@ -37,6 +37,10 @@ class ProgressLogger:
         self.logger.addHandler(console_handler)
         # self.logger.addHandler(file_handler)
 
+        # 已有专用 handler，不再向根 logger 传播：避免配置了根 handler 时重复输出，
+        # 每条进度消息也只经过一次 handler 加锁和格式化
+        self.logger.propagate = False
+
     def step(self, step_num: int, total: int, message: str, icon: str = "📋"):
         """显示步骤进度"""
         if not _enabled:
@@ -1,4 +1,5 @@
 """结构化日志系统 - 提供可追踪、可分析的调试日志"""
+import heapq
 import json
 import logging
 import time
@@ -8,6 +9,8 @@ from typing import Optional, Dict, Any, List
 from dataclasses import dataclass, asdict, field
 from enum import Enum
 
+from src.utils.json_io import dumps_bytes, loads
+
 
 class DebugPhase(Enum):
     """调试阶段"""
@@ -38,11 +41,13 @@ class PhaseLog:
     duration_ms: float = 0
     success: bool = True
     details: Dict[str, Any] = field(default_factory=dict)
+    # 单调时钟起点（纳秒），仅用于计算耗时，不受系统时间调整影响
+    start_ns: int = field(default_factory=time.perf_counter_ns, repr=False)
 
     def complete(self, success: bool = True, **details):
         """完成阶段"""
-        self.end_time = time.time()
-        self.duration_ms = (self.end_time - self.start_time) * 1000
+        self.duration_ms = (time.perf_counter_ns() - self.start_ns) / 1e6
+        self.end_time = self.start_time + self.duration_ms / 1000
         self.success = success
         self.details.update(details)
 
@@ -62,6 +67,7 @@ class DebugSession:
     success: bool = False
     end_time: float = 0
     total_duration_ms: float = 0
+    start_ns: int = field(default_factory=time.perf_counter_ns, repr=False)
 
     def to_dict(self) -> dict:
         """转换为字典"""
@@ -77,7 +83,10 @@ class DebugSession:
             "fix_method": self.fix_method,
             "attempts": self.attempts,
             "success": self.success,
-            "phases": [asdict(p) for p in self.phases]
+            "phases": [
+                {k: v for k, v in asdict(p).items() if k != "start_ns"}
+                for p in self.phases
+            ]
         }
 
 
@@ -110,6 +119,9 @@ class StructuredLogger:
         self._current_session: Optional[DebugSession] = None
         self._current_phase: Optional[PhaseLog] = None
 
+        # 已解析的会话日志文件: {路径: ((mtime_ns, size), 数据)}，只保留最近一次统计选中的文件
+        self._parsed_logs: Dict[Path, tuple] = {}
+
         # 标准 logger
         self.logger = logging.getLogger("debug_agent.structured")
 
@@ -132,8 +144,8 @@ class StructuredLogger:
             return None
 
         session = self._current_session
-        session.end_time = time.time()
-        session.total_duration_ms = (session.end_time - session.start_time) * 1000
+        session.total_duration_ms = (time.perf_counter_ns() - session.start_ns) / 1e6
+        session.end_time = session.start_time + session.total_duration_ms / 1000
         session.success = success
 
         # 写入文件日志
@@ -211,60 +223,80 @@ class StructuredLogger:
         else:
             self.logger.info(event)
 
-        if data:
-            self.logger.debug(f"  详情: {json.dumps(data, ensure_ascii=False, default=str)}")
+        # 序列化详情开销较大，只在 DEBUG 级别启用时才做
+        if data and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("  详情: %s", json.dumps(data, ensure_ascii=False, default=str))
 
     def _write_session_log(self, session: DebugSession):
         """写入会话日志到文件"""
         try:
             log_file = self.log_dir / f"{session.session_id}.json"
-            log_file.write_text(
-                json.dumps(session.to_dict(), ensure_ascii=False, indent=2),
-                encoding='utf-8'
-            )
+            log_file.write_bytes(dumps_bytes(session.to_dict()))
         except Exception as e:
             self.logger.warning(f"写入日志失败: {e}")
 
+    def _load_session_file(self, log_file: Path) -> dict:
+        """读取会话日志文件，文件未变化（mtime + 大小相同）时直接返回上次解析结果"""
+        stat = log_file.stat()
+        fingerprint = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self._parsed_logs.get(log_file)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+
+        data = loads(log_file.read_bytes())
+        self._parsed_logs[log_file] = (fingerprint, data)
+        return data
+
     def get_session_stats(self, last_n: int = 100) -> Dict[str, Any]:
         """获取最近 N 个会话的统计"""
         if not self.log_dir.exists():
             return {"total": 0}
 
+        # 文件名以时间戳命名，只选出最新的 N 个（无需对全部日志文件排序），再按时间先后处理
+        log_files = self.log_dir.glob("debug_*.json")
+        if last_n > 0:
+            recent_files = heapq.nlargest(last_n, log_files)[::-1]
+        else:
+            recent_files = sorted(log_files)[-last_n:]
+
+        # 只保留本次选中文件的解析缓存，缓存大小不随历史日志文件数增长
+        parsed_logs = self._parsed_logs
+        self._parsed_logs = {f: parsed_logs[f] for f in recent_files if f in parsed_logs}
+
         sessions = []
-        for log_file in sorted(self.log_dir.glob("debug_*.json"))[-last_n:]:
+        for log_file in recent_files:
             try:
-                data = json.loads(log_file.read_text(encoding='utf-8'))
-                sessions.append(data)
+                sessions.append(self._load_session_file(log_file))
             except:
                 continue
 
         if not sessions:
             return {"total": 0}
 
-        # 计算统计
-        success_count = sum(1 for s in sessions if s.get("success"))
-        total_time = sum(s.get("total_duration_ms", 0) for s in sessions)
-
-        # 按修复方法分类
+        # 单次遍历完成总体统计、按修复方法和按错误类型分类
+        success_count = 0
+        total_time = 0
         by_method = {}
-        for s in sessions:
-            method = s.get("fix_method", "unknown")
-            if method not in by_method:
-                by_method[method] = {"count": 0, "success": 0, "total_time_ms": 0}
-            by_method[method]["count"] += 1
-            if s.get("success"):
-                by_method[method]["success"] += 1
-            by_method[method]["total_time_ms"] += s.get("total_duration_ms", 0)
-
-        # 按错误类型分类
         by_error = {}
         for s in sessions:
-            err_type = s.get("error_type", "unknown")
-            if err_type not in by_error:
-                by_error[err_type] = {"count": 0, "success": 0}
-            by_error[err_type]["count"] += 1
-            if s.get("success"):
-                by_error[err_type]["success"] += 1
+            success = s.get("success")
+            duration = s.get("total_duration_ms", 0)
+
+            method_stats = by_method.setdefault(
+                s.get("fix_method", "unknown"), {"count": 0, "success": 0, "total_time_ms": 0}
+            )
+            method_stats["count"] += 1
+            method_stats["total_time_ms"] += duration
+
+            error_stats = by_error.setdefault(s.get("error_type", "unknown"), {"count": 0, "success": 0})
+            error_stats["count"] += 1
+
+            if success:
+                success_count += 1
+                method_stats["success"] += 1
+                error_stats["success"] += 1
+            total_time += duration
 
         return {
             "total": len(sessions),
@@ -4,10 +4,52 @@
 """
 
 import asyncio
+import os
 import sys
 import tempfile
 import shutil
 from pathlib import Path
+from types import SimpleNamespace
+
+# 离线模式：未配置 DEEPSEEK_API_KEY 或设置 DEBUG_AGENT_OFFLINE=1 时，用桩替换 LLM 客户端，
+# 测试不再产生网络请求；PatternFixer 能处理的用例不受影响
+OFFLINE = os.getenv("DEBUG_AGENT_OFFLINE") == "1" or not os.getenv("DEEPSEEK_API_KEY")
+
+# 临时项目文件很小且用完即删，Linux 下放到内存文件系统 /dev/shm，省去磁盘读写
+TEMP_ROOT = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+class _OfflineCompletions:
+    """模拟 chat.completions 接口，立即返回空响应"""
+
+    async def create(self, **kwargs):
+        message = SimpleNamespace(content="", tool_calls=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+class _OfflineClient:
+    """离线 LLM 客户端桩（OpenAI 兼容接口）"""
+
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=_OfflineCompletions())
+
+
+# 离线模式下传给 DebugAgent 的占位密钥：没有密钥时 AsyncOpenAI 在构造时就会报错，
+# 占位密钥只用于通过构造，客户端随后即被替换为桩，不会发出请求
+_OFFLINE_API_KEY = "offline-placeholder"
+
+
+def create_agent(project_path: str):
+    """创建 Debug Agent，离线模式下替换 LLM 客户端"""
+    from src.agent.debug_agent import DebugAgent
+
+    if not OFFLINE:
+        return DebugAgent(project_path=project_path)
+
+    agent = DebugAgent(project_path=project_path, api_key=_OFFLINE_API_KEY)
+    agent.code_fixer.client = _OfflineClient()
+    agent.llm.client = _OfflineClient()
+    return agent
 
 
 async def test_simple_import_error():
@@ -17,7 +59,7 @@ async def test_simple_import_error():
     print("=" * 60)
 
     # 创建临时测试项目
-    temp_dir = Path(tempfile.mkdtemp(prefix="debug_test_"))
+    temp_dir = Path(tempfile.mkdtemp(prefix="debug_test_", dir=TEMP_ROOT))
     print(f"临时目录: {temp_dir}")
 
     try:
@@ -55,10 +97,8 @@ if __name__ == "__main__":
         print(f"\n错误信息:\n{error_traceback}")
 
         # 初始化 Debug Agent
-        from src.agent.debug_agent import DebugAgent
-
         print("\n初始化 Debug Agent...")
-        agent = DebugAgent(project_path=str(temp_dir))
+        agent = create_agent(str(temp_dir))
 
         # 执行调试
         print("\n开始调试...")
@@ -123,7 +163,7 @@ async def test_name_error():
     print("集成测试 2: NameError 修复")
     print("=" * 60)
 
-    temp_dir = Path(tempfile.mkdtemp(prefix="debug_test_"))
+    temp_dir = Path(tempfile.mkdtemp(prefix="debug_test_", dir=TEMP_ROOT))
     print(f"临时目录: {temp_dir}")
 
     try:
@@ -153,10 +193,8 @@ if __name__ == "__main__":
         print(f"\n错误信息:\n{error_traceback[:200]}...")
 
         # 初始化 Debug Agent
-        from src.agent.debug_agent import DebugAgent
-
         print("\n初始化 Debug Agent...")
-        agent = DebugAgent(project_path=str(temp_dir))
+        agent = create_agent(str(temp_dir))
 
         # 执行调试
         print("\n开始调试...")
@@ -196,6 +234,8 @@ async def main():
     print("\n" + "=" * 60)
     print("Debug Agent 集成测试")
     print("=" * 60)
+    if OFFLINE:
+        print("离线模式: LLM 调用已替换为本地桩")
 
     results = []
 
@@ -203,20 +243,28 @@ async def main():
     result1 = await test_simple_import_error()
     results.append(("ImportError 修复", result1))
 
-    # 测试 2: NameError
-    result2 = await test_name_error()
-    results.append(("NameError 修复", result2))
+    # 测试 2: NameError（需要 LLM 生成修复，离线模式下跳过）
+    if OFFLINE:
+        results.append(("NameError 修复", None))
+    else:
+        result2 = await test_name_error()
+        results.append(("NameError 修复", result2))
 
     # 总结
     print("\n" + "=" * 60)
     print("测试总结")
     print("=" * 60)
 
+    # 结果为 None 表示该用例在离线模式下跳过，不计入总数
+    skipped = sum(1 for _, r in results if r is None)
     passed = sum(1 for _, r in results if r)
-    total = len(results)
+    total = len(results) - skipped
 
     for name, result in results:
-        status = "✅ 通过" if result else "❌ 失败"
+        if result is None:
+            status = "⏭️  跳过（需要 LLM）"
+        else:
+            status = "✅ 通过" if result else "❌ 失败"
         print(f"{name}: {status}")
 
     print(f"\n总计: {passed}/{total} 通过")